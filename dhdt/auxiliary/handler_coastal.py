@@ -1,8 +1,10 @@
 # functions to work with the coastal dataset
 import os
+from functools import lru_cache
 
 import geopandas
 import numpy as np
+from shapely import wkt
 
 from dhdt.generic.handler_landsat import get_bbox_from_path_row
 from dhdt.generic.handler_sentinel2 import (get_epsg_from_mgrs_tile,
@@ -24,7 +26,8 @@ def get_gshhg_url(url_type='ftp'):
 def get_coastal_dataset(geom_dir,
                         geom_name=None,
                         minimal_level=1,
-                        resolution='f'):
+                        resolution='f',
+                        clip_bbox=None):
     """ get geospatial data of the coast, see also [WS96] & [wwwGSHHG].
 
     Parameters
@@ -46,6 +49,9 @@ def get_coastal_dataset(geom_dir,
             * i: intermediate resolution: Another ~80 % reduction.
             * l: low resolution: Another ~80 % reduction.
             * c: crude resolution: Another ~80 % reduction.
+    clip_bbox : tuple, default=None
+        extent of interest in lat/lon, i.e.: (minx, miny, maxx, maxy), if given
+        only the features within this extent are cut and written out
 
     References
     ----------
@@ -66,6 +72,7 @@ def get_coastal_dataset(geom_dir,
     if not os.path.isdir(geom_dir):
         os.makedirs(geom_dir)
     if geom_name is None:
+        assert clip_bbox is None, 'please provide a name for the clipped data'
         geom_name = 'GSHHS_' + resolution + '_L' + str(minimal_level) + \
                     '.geojson'
 
@@ -81,11 +88,12 @@ def get_coastal_dataset(geom_dir,
               'GSHHS_' + resolution + '_L' + str(level + 1) + '.shp'
         sfull = os.path.join(geom_dir,
                              soi)  # full path of shapefile of interest
+        # features outside the extent are skipped while reading
         if level == 0:
-            gshhs = geopandas.read_file(sfull)
+            gshhs = geopandas.read_file(sfull, bbox=clip_bbox)
         else:
             print('starting to cut geometry, this can take a while')
-            hole = geopandas.read_file(sfull)
+            hole = geopandas.read_file(sfull, bbox=clip_bbox)
             gshhs = gshhs.overlay(hole, how='symmetric_difference')
             print('finished overlay analysis')
             del hole
@@ -102,12 +110,11 @@ def get_coastal_polygon_of_tile(tile_code,
                                 tile_system='MGRS',
                                 out_dir=None,
                                 geom_dir=None,
-                                geom_name=None):
+                                geom_name=None,
+                                minimal_level=1):
     if geom_dir is None:
         rot_dir = os.sep.join(os.path.realpath(__file__).split(os.sep)[:-3])
         geom_dir = os.path.join(rot_dir, 'data')
-    if geom_name is None:
-        geom_name = 'GSHHS_f_L1.geojson'
     if out_dir is None:
         out_dir = os.getcwd()
     if not os.path.isdir(out_dir):
@@ -122,6 +129,21 @@ def get_coastal_polygon_of_tile(tile_code,
         path, row = [], []
         toi = get_bbox_from_path_row(path, row)
 
+    if isinstance(toi, str):
+        toi = wkt.loads(toi)
+    if geom_name is None and minimal_level > 1:
+        # only cut the coastal geometry within the extent of the tile, as the
+        # overlay over the whole globe takes very long
+        geom_name = 'GSHHS_f_L' + str(minimal_level) + '_' + tile_code + \
+                    '.geojson'
+        get_coastal_dataset(geom_dir,
+                            geom_name=geom_name,
+                            minimal_level=minimal_level,
+                            clip_bbox=toi.bounds)
+    elif geom_name is None:
+        # no overlay is needed, hence all tiles share the global dataset
+        geom_name = 'GSHHS_f_L1.geojson'
+
     # get UTM extent, since not the whole world needs to be included
     utm_zone = get_utmzone_from_tile_code(tile_code)
     bound = clip_coastal_polygon(toi, utm_zone, geom_dir, geom_name)
@@ -137,12 +159,23 @@ def get_coastal_polygon_of_tile(tile_code,
     return
 
 
+@lru_cache(maxsize=4)
+def _load_gshhs(geom_path, mtime):
+    """ read coastal data once, and keep it with its spatial index in memory,
+    so consecutive tiles do not need to parse the file again. The
+    modification time is part of the key, thus a rewritten file is read
+    again"""
+    gshhs = geopandas.read_file(geom_path)
+    _ = gshhs.sindex
+    return gshhs
+
+
 def clip_coastal_polygon(geom, utm_zone, geom_dir, geom_name):
     """ clip global coastal dataset to extent of a given geometry
 
     Parameters
     ----------
-    geom : string
+    geom : {string, shapely.geometry}
         well known text of the geometry, i.e.: 'POLYGON ((x y, x y, x y))'
     utm_zone : signed integer
         code used to denote the number of the projection column of UTM
@@ -163,11 +196,12 @@ def clip_coastal_polygon(geom, utm_zone, geom_dir, geom_name):
     geom_path = os.path.join(geom_dir, geom_name)
     assert os.path.isfile(geom_path), 'make sure data is present'
 
-    gshhs = geopandas.read_file(geom_path)
+    gshhs = _load_gshhs(geom_path, os.path.getmtime(geom_path))
+    if isinstance(geom, str):
+        geom = wkt.loads(geom)
     geom = geopandas.GeoDataFrame(index=[0],
                                   crs='epsg:4326',
-                                  geometry=geopandas.GeoSeries.from_wkt([geom
-                                                                         ]))
+                                  geometry=geopandas.GeoSeries([geom]))
     bound = gshhs.clip(geom)
     bound = bound.to_crs(epsg=utm_epsg)
     return bound
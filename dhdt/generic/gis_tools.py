@@ -4,6 +4,8 @@ import numpy as np
 from osgeo import gdal, ogr, osr
 from scipy import ndimage
 
+from dhdt.generic.mapping_tools import set_spatial_filter_to_raster
+
 
 def create_crs_from_utm_zone(utm_code):
     """ generate GDAL SpatialReference from UTM code
@@ -36,7 +38,7 @@ def create_crs_from_utm_zone(utm_code):
     return crs
 
 
-def ll2utm(ll_fname, utm_fname, crs, aoi='RGIId'):
+def ll2utm(ll_fname, utm_fname, crs, aoi='RGIId', bbox=None):
     """ transfrom shapefile in Lat-Long to UTM coordinates
 
     Parameters
@@ -49,62 +51,34 @@ def ll2utm(ll_fname, utm_fname, crs, aoi='RGIId'):
         coordinate reference code
     aoi : string
         atribute to include. The default is 'RGIId'
+    bbox : numpy.array, size=(4,), optional
+        extent in the output projection, i.e.: min max X, min max Y. When
+        given only features overlapping with it are reprojected
     """
-    # making the shapefile as an object.
+    # the layer name is needed for the query
     inputShp = ogr.Open(ll_fname)
-    # getting layer information of shapefile.
-    inLayer = inputShp.GetLayer()
-    # get info for coordinate transformation
-    inSpatialRef = inLayer.GetSpatialRef()
-    # output SpatialReference
-    outSpatialRef = osr.SpatialReference()
-    outSpatialRef.ImportFromWkt(crs)
-    coordTrans = osr.CoordinateTransformation(inSpatialRef, outSpatialRef)
+    lyr_name = inputShp.GetLayer().GetName()
+    inputShp = None
 
     driver = ogr.GetDriverByName('ESRI Shapefile')
-    # create the output layer
     if os.path.exists(utm_fname):
         driver.DeleteDataSource(utm_fname)
-    outDataSet = driver.CreateDataSource(utm_fname)
-    outLayer = outDataSet.CreateLayer("reproject",
-                                      outSpatialRef,
-                                      geom_type=ogr.wkbMultiPolygon)
-    # outLayer = outDataSet.CreateLayer(
-    #     "reproject", geom_type=ogr.wkbMultiPolygon
-    # )
-
-    # add fields
-    fieldDefn = ogr.FieldDefn('RGIId', ogr.OFTInteger)
-    fieldDefn.SetWidth(14)
-    fieldDefn.SetPrecision(1)
-    outLayer.CreateField(fieldDefn)
-    # inLayerDefn = inLayer.GetLayerDefn()
-    # for i in range(0, inLayerDefn.GetFieldCount()):
-    #     fieldDefn = inLayerDefn.GetFieldDefn(i)
-    #     outLayer.CreateField(fieldDefn)
-
-    # get the output layer's feature definition
-    outLayerDefn = outLayer.GetLayerDefn()
-
-    # loop through the input features
-    inFeature = inLayer.GetNextFeature()
-    while inFeature:
-        # get the input geometry
-        geom = inFeature.GetGeometryRef()
-        # reproject the geometry
-        geom.Transform(coordTrans)
-        # create a new feature
-        outFeature = ogr.Feature(outLayerDefn)
-        # set the geometry and attribute
-        outFeature.SetGeometry(geom)
-        rgiStr = inFeature.GetField(aoi)
-        outFeature.SetField(aoi, int(rgiStr[9:]))
-        # add the feature to the shapefile
-        outLayer.CreateFeature(outFeature)
-        # dereference the features and get the next input feature
-        outFeature = None
-        inFeature = inLayer.GetNextFeature()
-    outDataSet = None  # this creates an error but is needed?????
+
+    # reproject and convert the identifier to an integer, all within GDAL,
+    # hence features do not need to be copied one by one
+    sql = (f'SELECT CAST(SUBSTR({aoi}, 10) AS integer) AS RGIId '
+           f'FROM "{lyr_name}"')
+    outDataSet = gdal.VectorTranslate(utm_fname,
+                                      ll_fname,
+                                      format='ESRI Shapefile',
+                                      SQLStatement=sql,
+                                      dstSRS=crs,
+                                      reproject=True,
+                                      layerName='reproject',
+                                      geometryType='PROMOTE_TO_MULTI',
+                                      **_get_spatial_filter_options(
+                                          bbox, crs))
+    outDataSet = None  # flush to disk
 
 
 def shape2raster(shp_fname,
@@ -146,6 +120,9 @@ def shape2raster(shp_fname,
     # making the shapefile as an object.
     rgiShp = ogr.Open(shp_fname)  # getting layer information of shapefile.
     rgiLayer = rgiShp.GetLayer()  # get required raster band.
+    # only burn the outlines that fall within the raster
+    set_spatial_filter_to_raster(rgiLayer, geoTransform, rows, cols,
+                                 spatialRef)
 
     driver = gdal.GetDriverByName('GTiff')
 
@@ -169,7 +146,18 @@ def get_mask_boundary(Msk):
     return Bnd
 
 
-def reproject_shapefile(path, in_file, targetprj):
+def _get_spatial_filter_options(bbox, crs):
+    if bbox is None:
+        return {}
+    # the rectangle is given in the output projection, GDAL transforms it
+    # to the input projection, so features can be skipped before reading
+    return {
+        'spatFilter': [bbox[0], bbox[2], bbox[1], bbox[3]],
+        'spatSRS': crs
+    }
+
+
+def reproject_shapefile(path, in_file, targetprj, bbox=None):
     """ transforms shapefile into other projection
 
     Parameters
@@ -180,6 +168,9 @@ def reproject_shapefile(path, in_file, targetprj):
         filename of input file
     targetprj : osgeo-structure
         spatial reference
+    bbox : numpy.array, size=(4,), optional
+        extent in the output projection, i.e.: min max X, min max Y. When
+        given only features overlapping with it are reprojected
 
     Returns
     -------
@@ -189,55 +180,24 @@ def reproject_shapefile(path, in_file, targetprj):
     """
     out_file = in_file[:-4] + '_utm.shp'
 
-    # getting layer information of shapefile.
-    inShp = ogr.Open(os.path.join(path, in_file))
-    inLayer = inShp.GetLayer()
-    inSpatialRef = inLayer.GetSpatialRef()
-
-    # create the CoordinateTransformation
-    coordTrans = osr.CoordinateTransformation(inSpatialRef, targetprj)
+    if not isinstance(targetprj, str):
+        targetprj = targetprj.ExportToWkt()
 
-    # create the output layer
     outputShapefile = os.path.join(path, out_file)
     driver = ogr.GetDriverByName('ESRI Shapefile')
     if os.path.isfile(outputShapefile):
         driver.DeleteDataSource(outputShapefile)
-    outDataSet = driver.CreateDataSource(outputShapefile)
-    outLayer = outDataSet.CreateLayer(out_file, geom_type=ogr.wkbMultiPolygon)
-
-    # add fields
-    inLayerDefn = inLayer.GetLayerDefn()
-    for i in range(0, inLayerDefn.GetFieldCount()):
-        fieldDefn = inLayerDefn.GetFieldDefn(i)
-        outLayer.CreateField(fieldDefn)
-
-    # get the output layer's feature definition
-    outLayerDefn = outLayer.GetLayerDefn()
-
-    # loop through the input features
-    inFeature = inLayer.GetNextFeature()
-    while inFeature:
-        # get the input geometry
-        geom = inFeature.GetGeometryRef()
-        # reproject the geometry
-        geom.Transform(coordTrans)
-        # create a new feature
-        outFeature = ogr.Feature(outLayerDefn)
-        # set the geometry and attribute
-        outFeature.SetGeometry(geom)
-        for i in range(0, outLayerDefn.GetFieldCount()):
-            outFeature.SetField(
-                outLayerDefn.GetFieldDefn(i).GetNameRef(),
-                inFeature.GetField(i))
-        # add the feature to the shapefile
-        outLayer.CreateFeature(outFeature)
-        # dereference the features and get the next input feature
-        outFeature = None
-        inFeature = inLayer.GetNextFeature()
-
-    # Save and close the shapefiles
-    inShp = None
-    outDataSet = None
+
+    # reproject all features and their fields in one go
+    outDataSet = gdal.VectorTranslate(outputShapefile,
+                                      os.path.join(path, in_file),
+                                      format='ESRI Shapefile',
+                                      dstSRS=targetprj,
+                                      reproject=True,
+                                      geometryType='PROMOTE_TO_MULTI',
+                                      **_get_spatial_filter_options(
+                                          bbox, targetprj))
+    outDataSet = None  # flush to disk
 
     return out_file
 
@@ -1,4 +1,6 @@
 # generic libraries
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 from scipy import linalg, ndimage
 from scipy.interpolate import griddata
@@ -242,6 +244,92 @@ def get_image_subset(Z, bbox):
     return sub_Z
 
 
+def get_tiling_grid(bbox, tile_size=512, overlap=32):
+    """ split a bounding box into tiles, with a halo around each tile
+
+    Parameters
+    ----------
+    bbox : np.array, size=(1,4)
+        [minimum row, maximum row, minimum collumn maximum collumn].
+    tile_size : integer, {x ∈ ℕ | x ≥ 1}, default=512
+        amount of pixels along the side of a tile
+    overlap : integer, {x ∈ ℕ | x ≥ 0}, default=32
+        amount of pixels each tile is extended with, so filters do not
+        suffer from border effects at the tile edges
+
+    Returns
+    -------
+    windows : np.array, size=(k,4), dtype=integer
+        extents of the tiles including their halo, clipped to the bbox
+    cores : np.array, size=(k,4), dtype=integer
+        extents of the tiles without halo, these do not overlap and together
+        they cover the bbox
+
+    See Also
+    --------
+    get_image_subset, apply_in_tiles
+    """
+    minI, maxI, minJ, maxJ = (int(b) for b in bbox)
+    I, J = np.meshgrid(np.arange(minI, maxI, tile_size),
+                       np.arange(minJ, maxJ, tile_size),
+                       indexing='ij')
+    I, J = I.ravel(), J.ravel()
+    cores = np.column_stack((I, np.minimum(I + tile_size, maxI),
+                             J, np.minimum(J + tile_size, maxJ)))
+    windows = np.column_stack((np.maximum(cores[:, 0] - overlap, minI),
+                               np.minimum(cores[:, 1] + overlap, maxI),
+                               np.maximum(cores[:, 2] - overlap, minJ),
+                               np.minimum(cores[:, 3] + overlap, maxJ)))
+    return windows, cores
+
+
+def apply_in_tiles(Z, func, tile_size=512, overlap=32, max_workers=None):
+    """ apply a function on an image tile by tile, where the tiles are
+    processed in parallel and mosaiced afterwards
+
+    Parameters
+    ----------
+    Z : np.array, size=(m,n), ndim={2,3}
+        data array
+    func : function
+        operation that returns an array of the same size as its input, it
+        should be defined at module level, so it can be send to a process
+    tile_size : integer, {x ∈ ℕ | x ≥ 1}, default=512
+        amount of pixels along the side of a tile
+    overlap : integer, {x ∈ ℕ | x ≥ 0}, default=32
+        halo around each tile, should be larger than the reach of "func"
+    max_workers : integer, default=None
+        amount of processes to use, when None all cores are used
+
+    Returns
+    -------
+    Z_new : np.array, size=(m,n), ndim={2,3}
+        mosaic of the processed tiles
+
+    See Also
+    --------
+    get_tiling_grid
+    """
+    assert isinstance(Z, np.ndarray), 'please provide an array'
+    windows, cores = get_tiling_grid((0, Z.shape[0], 0, Z.shape[1]),
+                                     tile_size=tile_size,
+                                     overlap=overlap)
+
+    Z_new = None
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        tiles = executor.map(func,
+                             (get_image_subset(Z, win) for win in windows))
+        for tile, win, core in zip(tiles, windows, cores):
+            # strip the halo, before placing the tile in the mosaic
+            tile = tile[core[0] - win[0]:core[1] - win[0],
+                        core[2] - win[2]:core[3] - win[2], ...]
+            if Z_new is None:
+                Z_new = np.empty(Z.shape[:2] + tile.shape[2:],
+                                 dtype=tile.dtype)
+            Z_new[core[0]:core[1], core[2]:core[3], ...] = tile
+    return Z_new
+
+
 def bilinear_interpolation(Z, di, dj):
     """ do bilinear interpolation of an image at different locations
 
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 
 import numpy as np
 import pandas as pd
@@ -372,6 +373,7 @@ def get_s2_granule_id(fname, s2_df):
     return granule_id
 
 
+@lru_cache(maxsize=None)
 def meta_s2string(s2_str):
     """ get meta information of the Sentinel-2 file name
 
@@ -10,15 +10,7 @@ def get_array_from_xml(treeStruc):
     Arrays within a xml structure are given line per line
     Output is an array
     """
-    for i in range(0, len(treeStruc)):
-        Trow = [float(s) for s in treeStruc[i].text.split(' ')]
-        if i == 0:
-            Tn = Trow
-        elif i == 1:
-            Trow = np.stack((Trow, Trow), 0)
-            Tn = np.stack((Tn, Trow[1, :]), 0)
-        else:
-            Tn = np.concatenate((Tn, [Trow]), 0)
+    Tn = np.array([row.text.split() for row in treeStruc], dtype=np.float64)
     return Tn
 
 
@@ -1,6 +1,7 @@
 import datetime
 import glob
 import os
+from functools import lru_cache
 from xml.etree import ElementTree
 
 import numpy as np
@@ -9,11 +10,18 @@ from netCDF4 import Dataset, date2num
 from osgeo import gdal, ogr, osr
 
 from dhdt.__version__ import __version__
-from dhdt.generic.mapping_tools import pix_centers
+from dhdt.generic.mapping_tools import (pix_centers,
+                                        set_spatial_filter_to_raster)
 from dhdt.generic.unit_check import correct_geoTransform, is_crs_an_srs
 from dhdt.generic.unit_conversion import deg2compass
 from dhdt.testing.mapping_tools import create_local_crs
 
+# imagery folders, such as the ones of Sentinel-2, hold many sidecar files,
+# hence do not list the directory at every opening of a raster. Sidecar files
+# are still probed individually. This is only done when not configured
+if gdal.GetConfigOption('GDAL_DISABLE_READDIR_ON_OPEN') is None:
+    gdal.SetConfigOption('GDAL_DISABLE_READDIR_ON_OPEN', 'TRUE')
+
 
 def read_geo_info(fname):
     """ This function takes as input the geotiff name and the path of the
@@ -47,11 +55,21 @@ def read_geo_info(fname):
     """
     assert len(glob.glob(fname)) != 0, ('file does not seem to be present')
 
+    # the modification time is included, so a rewritten file is read again
+    mtime = os.path.getmtime(fname) if os.path.isfile(fname) else None
+    spatialRef, geoTransform, rows, cols, bands = _read_geo_info(fname, mtime)
+    targetprj = osr.SpatialReference(wkt=spatialRef)
+    return spatialRef, geoTransform, targetprj, rows, cols, bands
+
+
+@lru_cache(maxsize=64)
+def _read_geo_info(fname, mtime):
+    # opening a raster, especially a JPEG2000, is costly, while the header
+    # is often asked for several times within a processing chain
     img = gdal.Open(fname)
     spatialRef = img.GetProjection()
     geoTransform = img.GetGeoTransform()
     geoTransform = tuple(float(x) for x in geoTransform)
-    targetprj = osr.SpatialReference(wkt=img.GetProjection())
     rows = int(img.RasterYSize)
     cols = int(img.RasterXSize)
     bands = img.RasterCount
@@ -60,10 +78,10 @@ def read_geo_info(fname):
         rows,
         cols,
     )
-    return spatialRef, geoTransform, targetprj, rows, cols, bands
+    return spatialRef, geoTransform, rows, cols, bands
 
 
-def read_geo_image(fname, boi=np.array([]), no_dat=None):
+def read_geo_image(fname, boi=np.array([]), no_dat=None, window=None):
     """ This function takes as input the geotiff name and the path of the
     folder that the images are stored, reads the image and returns the data as
     an array
@@ -77,6 +95,9 @@ def read_geo_image(fname, boi=np.array([]), no_dat=None):
         be specified
     no_dat : {integer,float}
          no data value
+    window : tuple, size=(4,), optional
+        pixel bounds (minI, maxI, minJ, maxJ) of the region of interest, if
+        given only this part of the raster is read and decoded
 
     Returns
     -------
@@ -111,10 +132,23 @@ def read_geo_image(fname, boi=np.array([]), no_dat=None):
     img = gdal.Open(fname)
     assert img is not None, ('could not open dataset ' + fname)
 
+    geoTransform = tuple(float(x) for x in img.GetGeoTransform())
+    if window is None:
+        win_args = ()
+    else:  # only decode the region of interest
+        minI, maxI, minJ, maxJ = (int(w) for w in window)
+        win_args = (minJ, minI, maxJ - minJ, maxI - minI)
+        geoTransform = (geoTransform[0] + minJ * geoTransform[1] +
+                        minI * geoTransform[2], geoTransform[1],
+                        geoTransform[2], geoTransform[3] +
+                        minJ * geoTransform[4] + minI * geoTransform[5],
+                        geoTransform[4], geoTransform[5])
+
     # imagery can consist of multiple bands
     if len(boi) == 0:
         for counter in range(img.RasterCount):
-            band = np.array(img.GetRasterBand(counter + 1).ReadAsArray())
+            band = np.array(
+                img.GetRasterBand(counter + 1).ReadAsArray(*win_args))
             if no_dat is None:
                 no_dat = img.GetRasterBand(counter + 1).GetNoDataValue()
             # create masked array
@@ -127,14 +161,14 @@ def read_geo_image(fname, boi=np.array([]), no_dat=None):
         assert (np.max(boi) +
                 1) <= num_bands, 'bands of interest is out of range'
         for band_id, counter in enumerate(boi):
-            band = np.array(img.GetRasterBand(band_id + 1).ReadAsArray())
+            band = np.array(
+                img.GetRasterBand(band_id + 1).ReadAsArray(*win_args))
             no_dat = img.GetRasterBand(counter + 1).GetNoDataValue()
             np.putmask(band, band == no_dat, np.nan)
             data = band if counter == 0 else np.dstack(
                 (data, np.atleast_3d(band)))
     spatialRef = img.GetProjection()
-    geoTransform = tuple(float(x)
-                         for x in img.GetGeoTransform()) + data.shape[:2]
+    geoTransform += data.shape[:2]
     targetprj = osr.SpatialReference(wkt=img.GetProjection())
     return data, spatialRef, geoTransform, targetprj
 
@@ -229,7 +263,11 @@ def make_geo_im(Z,
         ysize=Z.shape[0],
         bands=bands,
         eType=gdal_dtype,
-        options=['TFW=YES', 'COMPRESS=LZW', "PREDICTOR=" + predictor])
+        options=[
+            'TFW=YES', 'COMPRESS=LZW', "PREDICTOR=" + predictor,
+            'TILED=YES', 'BLOCKXSIZE=256', 'BLOCKYSIZE=256',
+            'NUM_THREADS=ALL_CPUS'
+        ])  # tiled, so windowed reads only decode the blocks they touch
 
     # set metadata in datasource
     ds.SetMetadata({
@@ -433,6 +471,9 @@ def make_im_from_geojson(geoTransform,
     # read shapefile
     shp = ogr.Open(geom_path)
     lyr = shp.GetLayer()
+    # only burn the geometries that fall within the raster
+    set_spatial_filter_to_raster(lyr, geoTransform, geoTransform[6],
+                                 geoTransform[7], crs)
 
     # create raster environment
     driver = gdal.GetDriverByName('GTiff')
@@ -6,7 +6,6 @@ from osgeo import ogr, osr
 from scipy import ndimage
 
 from dhdt.generic.attitude_tools import rot_mat
-from dhdt.generic.handler_im import get_grad_filters
 from dhdt.generic.unit_check import (are_two_arrays_equal,
                                      correct_floating_parameter,
                                      correct_geoTransform, is_crs_an_srs)
@@ -577,17 +576,22 @@ def cast_orientation(Z, Az, indexing='ij'):
     """
     assert isinstance(Z, np.ndarray), 'please provide an array'
 
-    fx, fy = get_grad_filters(ftype='sobel', tsize=3, order=1)
-
-    Zdx = ndimage.convolve(Z, fx)  # steerable filters
-    Zdy = ndimage.convolve(Z, fy)
+    # steerable filters, the sobel kernels are separable, hence these are
+    # applied as two one dimensional passes, see also get_grad_filters
+    smooth, deriv = np.array([1, 2, 1]) / 4, np.array([-1, 0, +1])
+    Zdx = ndimage.convolve1d(ndimage.convolve1d(Z, smooth, axis=0),
+                             deriv,
+                             axis=1)
+    Zdy = ndimage.convolve1d(ndimage.convolve1d(Z, np.flip(deriv), axis=0),
+                             smooth,
+                             axis=1)
 
+    # keep single precision imagery in single precision
+    Az = np.radians(Az, dtype=np.result_type(Z.dtype, np.float32))
     if indexing == 'ij':
-        Zcan = (np.multiply(np.cos(np.radians(Az)), Zdy) -
-                np.multiply(np.sin(np.radians(Az)), Zdx))
+        Zcan = np.cos(Az) * Zdy - np.sin(Az) * Zdx
     else:
-        Zcan = (np.multiply(np.cos(np.radians(Az)), Zdy) +
-                np.multiply(np.sin(np.radians(Az)), Zdx))
+        Zcan = np.cos(Az) * Zdy + np.sin(Az) * Zdx
     return Zcan
 
 
@@ -1203,6 +1207,44 @@ def get_bbox_polygon(geoTransform, rows, cols):
     return poly
 
 
+def set_spatial_filter_to_raster(layer, geoTransform, rows, cols, crs):
+    """ restrict an OGR layer to the features that overlap with a raster, so
+    that later passes over the layer (e.g. rasterization) skip the others
+
+    Parameters
+    ----------
+    layer : ogr.Layer
+        vector layer of interest
+    geoTransform : tuple, size=(6,1)
+        georeference transform of the raster.
+    rows : integer, {x ∈ ℕ | x ≥ 0}
+        amount of rows in the raster.
+    cols : integer, {x ∈ ℕ | x ≥ 0}
+        amount of collumns in the raster.
+    crs : {string, osr.SpatialReference}
+        coordinate reference system of the raster
+
+    See Also
+    --------
+    get_bbox_polygon
+    """
+    poly = get_bbox_polygon(geoTransform, rows, cols)
+    lyr_srs = layer.GetSpatialRef()
+    if lyr_srs is not None:
+        if isinstance(crs, str):
+            crs = osr.SpatialReference(wkt=crs)
+        im_srs, lyr_srs = crs.Clone(), lyr_srs.Clone()
+        im_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+        lyr_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+        # densify the border, as it can bend in the other projection
+        bbox = get_bbox(geoTransform, rows, cols)
+        poly.Segmentize(float(max(bbox[1] - bbox[0], bbox[3] - bbox[2])) /
+                        100)
+        poly.Transform(osr.CoordinateTransformation(im_srs, lyr_srs))
+    layer.SetSpatialFilter(poly)
+    return
+
+
 def find_overlapping_DEM_tiles(dem_path, dem_file, poly_tile):
     '''
     loop through a shapefile of tiles, to find overlap with a given geometry
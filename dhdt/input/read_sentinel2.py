@@ -9,10 +9,9 @@ import pandas as pd
 from osgeo import osr
 from PIL import Image, ImageDraw
 from scipy.interpolate import RegularGridInterpolator
-from scipy.ndimage import label
+from scipy.ndimage import distance_transform_edt, label
 from scipy.signal import convolve2d
 from skimage.transform import resize
-from sklearn.neighbors import NearestNeighbors
 
 from dhdt.generic.handler_sentinel2 import get_s2_dict
 from dhdt.generic.handler_xml import get_array_from_xml, get_root_of_table
@@ -321,7 +320,7 @@ def dn2toa_s2(dn):
     return reflectance_toa
 
 
-def read_band_s2(path, band=None):
+def read_band_s2(path, band=None, window=None):
     """
     This function takes as input the Sentinel-2 band name and the path of the
     folder that the images are stored, reads the image and returns the data as
@@ -333,6 +332,9 @@ def read_band_s2(path, band=None):
         path of the folder, or full path with filename as well
     band : string, optional
         Sentinel-2 band name, for example '04', '8A'.
+    window : tuple, size=(4,), optional
+        pixel bounds (minI, maxI, minJ, maxJ), if given only this subset of
+        the tile is decoded
 
     Returns
     -------
@@ -385,7 +387,7 @@ def read_band_s2(path, band=None):
     assert os.path.isfile(fname), ('file does not seem to be present')
 
     data, spatialRef, geoTransform, targetprj = \
-        read_geo_image(glob.glob(fname)[0])
+        read_geo_image(glob.glob(fname)[0], window=window)
     return data, spatialRef, geoTransform, targetprj
 
 
@@ -852,13 +854,13 @@ def read_sun_angles_s2(path, fname='MTD_TL.xml'):
     mI, nI = get_image_size_s2_from_root(root)
     Zn = get_sun_angles_s2_from_root(root, angle='Zenith')[0]
 
-    zi = np.linspace(0 - 10, mI + 10, np.size(Zn, axis=0))
-    zj = np.linspace(0 - 10, nI + 10, np.size(Zn, axis=1))
+    zi = np.linspace(0 - 10, mI + 10, Zn.shape[0])
+    zj = np.linspace(0 - 10, nI + 10, Zn.shape[1])
 
     interp = RegularGridInterpolator((zi, zj), Zn)
 
-    iGrd, jGrd = np.arange(0, mI), np.arange(0, nI)
-    Igrd, Jgrd = np.meshgrid(iGrd, jGrd)
+    # broadcast the image axes, instead of constructing full mesh grids
+    Igrd, Jgrd = np.arange(0, mI)[:, np.newaxis], np.arange(0, nI)[np.newaxis]
 
     Zn = interp((Igrd, Jgrd))
     del zi, zj
@@ -866,8 +868,8 @@ def read_sun_angles_s2(path, fname='MTD_TL.xml'):
     # get Azimuth array
     Az = get_sun_angles_s2_from_root(root, angle='Azimuth')[0]
 
-    ai = np.linspace(0 - 10, mI + 10, np.size(Az, axis=0))
-    aj = np.linspace(0 - 10, nI + 10, np.size(Az, axis=1))
+    ai = np.linspace(0 - 10, mI + 10, Az.shape[0])
+    aj = np.linspace(0 - 10, nI + 10, Az.shape[1])
 
     interp = RegularGridInterpolator((ai, aj), Az)
     Az = interp((Igrd, Jgrd))
@@ -1122,17 +1124,30 @@ def read_view_angles_s2(path,
                         'ignore', r'All-NaN (slice|axis) encountered')
                     Az_samp = np.nanmax(Az_samp, axis=2)
 
-            IN = np.invert(np.isnan(Zn_samp))
-            nbrs = NearestNeighbors(n_neighbors=1, algorithm='kd_tree').fit(
-                np.stack((I_grd[IN], J_grd[IN])).T)
+            # fill the gaps in the coarse grid with their nearest neighbour,
+            # so it can be upsampled through a regular grid interpolator
+            OUT = np.isnan(Zn_samp)
+            if np.any(OUT):
+                nn_idx = distance_transform_edt(OUT,
+                                                return_distances=False,
+                                                return_indices=True)
+                Zn_samp = Zn_samp[tuple(nn_idx)]
+                Az_samp = Az_samp[tuple(nn_idx)]
 
             det_arr = np.isin(det_stack[:, :, idx], det_grp[i, :])
-            det_i, det_j = np.where(det_arr)
-            det_i, det_j = det_i.astype('float64'), det_j.astype('float64')
-
-            _, indices = nbrs.kneighbors(np.stack((det_i, det_j)).T)
-            Zn_bnd[det_arr] = np.squeeze(Zn_samp[IN][indices])
-            Az_bnd[det_arr] = np.squeeze(Az_samp[IN][indices])
+            det_ij = np.stack(np.where(det_arr)).T.astype('float64')
+
+            grd_ij = (I_grd[:, 0], J_grd[0, :])
+            Zn_bnd[det_arr] = RegularGridInterpolator(
+                grd_ij, Zn_samp, bounds_error=False, fill_value=None)(det_ij)
+            # the azimuth is circular, hence interpolate its vector components
+            # so the wrap-around at North does not average towards South
+            Az_cs = np.dstack((np.cos(np.radians(Az_samp)),
+                               np.sin(np.radians(Az_samp))))
+            Az_cs = RegularGridInterpolator(
+                grd_ij, Az_cs, bounds_error=False, fill_value=None)(det_ij)
+            Az_bnd[det_arr] = np.mod(
+                np.degrees(np.arctan2(Az_cs[:, 1], Az_cs[:, 0])), 360)
         if Zn is None:
             Zn, Az = Zn_bnd.copy(), Az_bnd.copy()
         else:
@@ -1334,9 +1349,8 @@ def read_detector_mask(path_meta, boi, geoTransform):
                 ij_arr = np.hstack((j_arr[:, np.newaxis], i_arr[:,
                                                                 np.newaxis]))
                 # make mask
-                msk = Image.new("L",
-                                [np.size(det_stack, 1),
-                                 np.size(det_stack, 0)], 0)
+                msk = Image.new("L", [det_stack.shape[1], det_stack.shape[0]],
+                                0)
                 ImageDraw.Draw(msk).polygon(tuple(map(tuple, ij_arr[:, 0:2])),
                                             outline=det_num,
                                             fill=det_num)
@@ -1511,8 +1525,8 @@ def get_xy_poly_from_gml(gml_struct, idx):
     pos_dim = gml_struct[idx][1][0][0][0][0].attrib
     pos_dim = int(list(pos_dim.items())[0][1])
     pos_list = gml_struct[idx][1][0][0][0][0].text
-    pos_row = [float(s) for s in pos_list.split(' ')]
-    pos_arr = np.array(pos_row).reshape((int(len(pos_row) / pos_dim), pos_dim))
+    pos_arr = np.fromstring(pos_list, dtype=float, sep=' ').reshape(
+        (-1, pos_dim))
     return pos_arr, det_num
 
 
@@ -7,6 +7,31 @@ from osgeo import gdal, ogr, osr
 def dh_txt2shp(dh_mat, DEM_1, DEM_2, shp_name, srs):
     """
     dh matrix to shapefile with matches
+
+    See Also
+    --------
+    dh_txt2shp_iter : same, but consumes the matches one row at a time
+    """
+    rows = zip(dh_mat[:, 0], dh_mat[:, 1], dh_mat[:, 2], dh_mat[:, 3],
+               dh_mat[:, -2], dh_mat[:, -1], DEM_1, DEM_2)
+    dh_txt2shp_iter(rows, shp_name, srs)
+    return
+
+
+def dh_txt2shp_iter(rows, shp_name, srs):
+    """
+    write matches to a shapefile, while streaming them from an iterable
+
+    Parameters
+    ----------
+    rows : iterable
+        yields tuples of (x_1, y_1, x_2, y_2, dh, score, h_1, h_2), hence
+        a generator can be given so the matches never need to be stacked
+        into one array
+    shp_name : string
+        path and filename of the shapefile
+    srs : {string, osr.SpatialReference}
+        coordinate reference system
     """
 
     if isinstance(srs, str):
@@ -29,20 +54,20 @@ def dh_txt2shp(dh_mat, DEM_1, DEM_2, shp_name, srs):
     layer.CreateField(ogr.FieldDefn('h1', ogr.OFTReal))
     layer.CreateField(ogr.FieldDefn('h2', ogr.OFTReal))
     layer.CreateField(ogr.FieldDefn('score', ogr.OFTReal))
+    layer_defn = layer.GetLayerDefn()
 
-    # Process the text file and add attributes and features to the shapefile
-    for j in range(dh_mat.shape[0]):
+    # Process the rows and add attributes and features to the shapefile
+    for x_1, y_1, x_2, y_2, dh, score, h_1, h_2 in rows:
         # create the feature
-        feature = ogr.Feature(layer.GetLayerDefn())
-        # Set the attributes using the values from the delimited text file
-        feature.SetField('dh', dh_mat[j, -2])
-        feature.SetField('score', dh_mat[j, -1])
-        feature.SetField('h1', DEM_1[j])
-        feature.SetField('h2', DEM_2[j])
+        feature = ogr.Feature(layer_defn)
+        feature.SetField('dh', float(dh))
+        feature.SetField('score', float(score))
+        feature.SetField('h1', float(h_1))
+        feature.SetField('h2', float(h_2))
 
         line = ogr.Geometry(ogr.wkbLineString)
-        line.AddPoint(dh_mat[j, 0], dh_mat[j, 1])
-        line.AddPoint(dh_mat[j, 2], dh_mat[j, 3])
+        line.AddPoint(float(x_1), float(y_1))
+        line.AddPoint(float(x_2), float(y_2))
         feature.SetGeometry(line)
 
         layer.CreateFeature(
@@ -69,14 +69,15 @@ def write_df_to_conn_file(df, conn_dir, conn_file="conn.txt", append=False):
     IN = col_idx != -1
     col_idx = col_idx[IN]
 
+    lines = []
     if append and os.path.isfile(conn_path):
-        f = open(conn_path, 'a+')
+        mode = 'a+'
     else:
-        f = open(conn_path, 'w')
-        print('# ' + ' '.join(tuple(np.array(col_names)[IN])), file=f)
+        mode = 'w'
+        lines.append('# ' + ' '.join(tuple(np.array(col_names)[IN])) + '\n')
 
-    # write rows of dataframe into text file
-    for k in range(df_sel.shape[0]):
+    # format rows of dataframe
+    for row in df_sel.itertuples(index=False, name=None):
         line = ''
         for idx, val in enumerate(col_idx):
             col_oi = df_sel.columns[val]
@@ -84,19 +85,22 @@ def write_df_to_conn_file(df, conn_dir, conn_file="conn.txt", append=False):
                     'timestamp',
                     'date',
             ):
-                line += str(df_sel.iloc[k, val])[:10]
+                line += str(row[val])[:10]
             elif col_oi in ('azimuth', 'zenith', 'zenith_refrac', 'caster_zn',
                             'caster_az', 'casted_zn', 'casted_az'):
-                line += '{:+3.4f}'.format(df_sel.iloc[k, val])
+                line += '{:+3.4f}'.format(row[val])
             elif col_oi in ('caster_Z', 'casted_Z', 'dh'):
-                line += '{:+4.2f}'.format(df_sel.iloc[k, val])
+                line += '{:+4.2f}'.format(row[val])
             elif col_oi in ('orbit_id', 'caster_id', 'glacier_id'):
-                line += "{:03d}".format(df_sel.iloc[k, val])
+                line += "{:03d}".format(row[val])
             else:
-                line += '{:+8.2f}'.format(df_sel.iloc[k, val])
+                line += '{:+8.2f}'.format(row[val])
             line += ' '
-        print(line[:-1], file=f)  # remove last spacer
-    f.close()
+        lines.append(line[:-1] + '\n')  # remove last spacer
+
+    # write to file, all at once
+    with open(conn_path, mode) as f:
+        f.writelines(lines)
     return
 
 
@@ -104,18 +108,18 @@ def write_df_to_belev_file(df, belev_dir, rgi_num=0, rgi_region=0):
     belev_name = 'belev_' + str(rgi_region).zfill(2) + '.' + \
                  str(rgi_num).zfill(5) + '.dat.txt'
     belev_path = os.path.join(belev_dir, belev_name)
-    f = open(belev_path, 'w')
-
     header = 'Elev  ' + "  ".join(list(map(str, df.columns)))
-    print(header, file=f)
 
     def func(x):
         return '{:+.2f}'.format(x)
 
-    for index, row in df.iterrows():
-        line = index + "  " + "  ".join(list(map(func, row)))
-        print(line, file=f)
-    f.close()
+    lines = [
+        index + "  " + "  ".join(list(map(func, row))) + '\n'
+        for index, *row in df.itertuples(name=None)
+    ]
+    with open(belev_path, 'w') as f:
+        print(header, file=f)
+        f.writelines(lines)
     return
 
 
@@ -1106,21 +1110,29 @@ def get_hypsometric_elevation_change(dxyt, Z=None, geoTransform=None):
     return dhdt
 
 
-def get_hypsometric_elevation_change_rec(dxyt, Z=None, geoTransform=None):
-    i_1, j_1 = map2pix(geoTransform, dxyt['X_1'].to_numpy(),
-                       dxyt['Y_1'].to_numpy())
-    i_2, j_2 = map2pix(geoTransform, dxyt['X_2'].to_numpy(),
-                       dxyt['Y_2'].to_numpy())
+def _get_elevation_at_pairs(Z, geoTransform, x_1, y_1, x_2, y_2):
+    # transform and sample both instances and their mid point in one go
+    k = x_1.size
+    i, j = map2pix(geoTransform, np.concatenate((x_1, x_2)),
+                   np.concatenate((y_1, y_2)))
+    i_12, j_12 = (i[:k] + i[k:]) / 2, (j[:k] + j[k:]) / 2
 
-    Z_1 = ndimage.map_coordinates(Z, [i_1, j_1], order=1, mode='mirror')
-    Z_2 = ndimage.map_coordinates(Z, [i_2, j_2], order=1, mode='mirror')
+    Z_ij = ndimage.map_coordinates(
+        Z, [np.concatenate((i, i_12)), np.concatenate((j, j_12))],
+        order=1,
+        mode='mirror')
+    Z_1, Z_2, Z_12 = Z_ij[:k], Z_ij[k:2 * k], Z_ij[2 * k:]
+    return Z_1, Z_2, Z_12
 
-    # calculate mid point elevation
-    Z_12 = ndimage.map_coordinates(Z, [(i_1 + i_2) / 2, (j_1 + j_2) / 2],
-                                   order=1,
-                                   mode='mirror')
 
-    dZ = np.squeeze(Z_1) - np.squeeze(Z_2)
+def get_hypsometric_elevation_change_rec(dxyt, Z=None, geoTransform=None):
+    Z_1, Z_2, Z_12 = _get_elevation_at_pairs(Z, geoTransform,
+                                             np.asarray(dxyt['X_1']),
+                                             np.asarray(dxyt['Y_1']),
+                                             np.asarray(dxyt['X_2']),
+                                             np.asarray(dxyt['Y_2']))
+
+    dZ = Z_1 - Z_2
     dz_12 = dxyt['dH_12'] - dZ
 
     desc = np.dtype([('T_1', '<M8[D]'), ('T_2', '<M8[D]'),
@@ -1131,18 +1143,11 @@ def get_hypsometric_elevation_change_rec(dxyt, Z=None, geoTransform=None):
 
 
 def get_hypsometric_elevation_change_np(dxyt, Z=None, geoTransform=None):
-    i_1, j_1 = map2pix(geoTransform, dxyt[:, 0], dxyt[:, 1])
-    i_2, j_2 = map2pix(geoTransform, dxyt[:, 3], dxyt[:, 4])
-
-    Z_1 = ndimage.map_coordinates(Z, [i_1, j_1], order=1, mode='mirror')
-    Z_2 = ndimage.map_coordinates(Z, [i_2, j_2], order=1, mode='mirror')
+    Z_1, Z_2, Z_12 = _get_elevation_at_pairs(Z, geoTransform, dxyt[:, 0],
+                                             dxyt[:, 1], dxyt[:, 3],
+                                             dxyt[:, 4])
 
-    # calculate mid point elevation
-    Z_12 = ndimage.map_coordinates(Z, [(i_1 + i_2) / 2, (j_1 + j_2) / 2],
-                                   order=1,
-                                   mode='mirror')
-
-    dZ = np.squeeze(Z_1) - np.squeeze(Z_2)
+    dZ = Z_1 - Z_2
     dz_12 = dxyt[:, -1] - dZ
 
     dhdt = np.stack((dxyt[:, 2], dxyt[:, 5], Z_12, dz_12))
@@ -1,5 +1,5 @@
 import numpy as np
-from scipy import ndimage
+from scipy import ndimage, special
 
 from dhdt.generic.mapping_tools import get_max_pixel_spacing
 from dhdt.generic.unit_conversion import deg2arg
@@ -135,12 +135,11 @@ def sun_angles_to_vector(az, zn, indexing='ij'):
 
     """
     az, zn = np.deg2rad(az), np.deg2rad(zn)
+    sin_az, cos_az, sin_zn = np.sin(az), np.cos(az), np.sin(zn)
     if indexing == 'ij':  # local image system
-        sun = np.dstack(
-            (-np.cos(az) * np.sin(zn), +np.sin(az) * np.sin(zn), +np.cos(zn)))
+        sun = np.dstack((-cos_az * sin_zn, +sin_az * sin_zn, +np.cos(zn)))
     else:  # 'xy' that is map coordinates
-        sun = np.dstack(
-            (+np.sin(az) * np.sin(zn), +np.cos(az) * np.sin(zn), +np.cos(zn)))
+        sun = np.dstack((+sin_az * sin_zn, +cos_az * sin_zn, +np.cos(zn)))
 
     if type(az) in (np.ndarray, ):
         return sun
@@ -241,15 +240,30 @@ def make_shadowing(Z,
     az = deg2arg(az)  # give range -180...+180
     if isinstance(spac, tuple):
         spac = get_max_pixel_spacing(spac)
-
-    Zr = ndimage.rotate(Z, az, axes=(1, 0), cval=-1, order=3)
-    # mask based
-    Mr = ndimage.rotate(np.zeros(Z.shape, dtype=bool),
-                        az,
-                        axes=(1, 0),
-                        cval=False,
-                        order=0,
-                        prefilter=False)
+    Z = np.asarray(Z, dtype=np.float32)  # single precision is sufficient
+
+    # construct rays along the illumination direction, these are one pixel
+    # apart and cover the whole grid, so no rotation of the grid is needed
+    m, n = Z.shape
+    d_i, d_j = +np.cos(np.radians(az)), -np.sin(np.radians(az))  # along ray
+    e_i, e_j = -d_j, +d_i  # perpendicular to the ray
+    c_i, c_j = m // 2, n // 2  # centre pixel, so rays go through pixels
+    s_max = np.ceil(np.abs(d_i) * max(c_i, m - 1 - c_i) +
+                    np.abs(d_j) * max(c_j, n - 1 - c_j))
+    r_max = np.ceil(np.abs(e_i) * max(c_i, m - 1 - c_i) +
+                    np.abs(e_j) * max(c_j, n - 1 - c_j))
+    s = np.arange(-s_max, s_max + 1)[:, np.newaxis]
+    r = np.arange(-r_max, r_max + 1)[np.newaxis, :]
+
+    # sample the elevation along all rays at once
+    I, J = c_i + s * d_i + r * e_i, c_j + s * d_j + r * e_j
+    Zr = ndimage.map_coordinates(Z, [I, J],
+                                 output=np.float32,
+                                 order=1,
+                                 mode='nearest')
+    OUT = (I < -.5) | (I > m - .5) | (J < -.5) | (J > n - .5)
+    Zr[OUT] = np.nan
+    del I, J, OUT
 
     if not isinstance(zn, np.ndarray):
         zn, weights = np.array([zn]), np.array([1])
@@ -258,30 +272,27 @@ def make_shadowing(Z,
 
     for idx, zenit in enumerate(zn):
         dZ = np.tan(np.radians(90 - zenit)) * spac
-        for i in range(1, Zr.shape[0]):
-            Mr[i, :] = (Zr[i, :]) < (Zr[i - 1, :] - dZ)
-            Zr[i, :] = np.maximum(Zr[i, :], Zr[i - 1, :] - dZ)
+        # a pixel is in shadow if it lies below the running maximum of the
+        # casting height, this recurrence along the ray becomes a cumulative
+        # maximum when the descent along the ray is added to the elevation
+        Wr = Zr + ((s + s_max) * dZ).astype(np.float32)
+        Hr = np.fmax.accumulate(Wr, axis=0)
+        Mr = np.zeros(Zr.shape, dtype=bool)
+        np.less(Wr[1:, :], Hr[:-1, :], out=Mr[1:, :])
+        del Wr, Hr
         if radiation:
             Mr = np.invert(Mr)
 
         if idx > 0:
             Mrs += weights[idx] * Mr.astype(int)
         else:
-            Mrs = weights[idx] * Mr.astype(int).copy()
-
-    Ms = ndimage.rotate(Mrs,
-                        -az,
-                        axes=(1, 0),
-                        cval=0,
-                        order=0,
-                        mode='constant',
-                        prefilter=False)
-    i_min = int(np.floor((Ms.shape[0] - Z.shape[0]) / 2))
-    i_max = int(np.floor((Ms.shape[0] + Z.shape[0]) / 2))
-    j_min = int(np.floor((Ms.shape[1] - Z.shape[1]) / 2))
-    j_max = int(np.floor((Ms.shape[1] + Z.shape[1]) / 2))
-
-    Sw = Ms[i_min:i_max, j_min:j_max]
+            Mrs = weights[idx] * Mr.astype(int)
+
+    # look up the closest ray sample for every pixel of the grid
+    i, j = np.arange(m)[:, np.newaxis] - c_i, np.arange(n)[np.newaxis, :] - c_j
+    k_s = np.rint(i * d_i + j * d_j + s_max).astype(int)
+    k_r = np.rint(i * e_i + j * e_j + r_max).astype(int)
+    Sw = Mrs[k_s, k_r]
     # remove edge cases by copying
     if border in ('copy'):
         Sw[:, -1], Sw[-1, :] = Sw[:, -2], Sw[-2, :]
@@ -291,6 +302,31 @@ def make_shadowing(Z,
     return Sw
 
 
+def _lambertian_from_gradient(dx, dy, sun):
+    """ dot product of the unit surface normal with the sun vector, the
+    normal is (dx, dy, 1), hence the grid is traversed a few times in place,
+    without stacking the normals
+
+    Returns
+    -------
+    L : numpy.array, size=(m,n), range=-1...+1
+        cosine of the illumination angle
+    n_z : numpy.array, size=(m,n), range=0...1
+        vertical component of the unit surface normal
+    """
+    n_z = np.square(dx)
+    n_z += np.square(dy)
+    n_z += 1
+    np.sqrt(n_z, out=n_z)
+    np.reciprocal(n_z, out=n_z)
+
+    L = dx * sun[..., 0]
+    L += dy * sun[..., 1]
+    L += sun[..., 2]
+    L *= n_z
+    return L, n_z
+
+
 def make_shading(Z, az, zn, spac=10):
     """ create synthetic shading image from given sun angles
 
@@ -338,27 +374,50 @@ def make_shading(Z, az, zn, spac=10):
     """
     if isinstance(spac, tuple):
         spac = get_max_pixel_spacing(spac)
-    sun = sun_angles_to_vector(az, zn, indexing='xy')
+    Z = np.asarray(Z, dtype=np.float32)  # single precision is sufficient
+    sun = sun_angles_to_vector(az, zn, indexing='xy').astype(np.float32)
 
     # estimate surface normals
 
     # the first array stands for the gradient in rows and
     # the second one in columns direction
-    dy, dx = np.gradient(Z * spac)
-
-    normal = np.dstack((dx, dy, np.ones_like(Z)))
-    n = np.linalg.norm(normal, axis=2)
-    normal[..., 0] /= n
-    normal[..., 1] /= n
-    normal[..., 2] /= n
+    dy, dx = np.gradient(Z * np.float32(spac))
 
-    Sh = normal[..., 0] * sun[..., 0] + \
-        normal[..., 1] * sun[..., 1] + \
-        normal[..., 2] * sun[..., 2]
+    Sh = _lambertian_from_gradient(dx, dy, sun)[0]
     return Sh
 
 
-def make_doppler_range(Z, az, zn, Lambertian=True, spac=10):
+def _get_rotation_transform(shape, az):
+    """ get the transformation of ndimage.rotate, with axes=(1,0) and
+    reshape=True, so it can be used for several grids of the same shape
+
+    Parameters
+    ----------
+    shape : tuple, size=2
+        dimension of the grid
+    az : float, unit=degrees
+        rotation angle
+
+    Returns
+    -------
+    R : numpy.ndarray, size=(2,2)
+        rotation matrix, mapping the rotated grid towards the original
+    offset : numpy.ndarray, size=(2,)
+        offset of the transformation
+    shape_r : tuple, size=2
+        dimension of the rotated grid
+    """
+    c, s = special.cosdg(az), special.sindg(az)
+    R = np.array([[c, s], [-s, c]])
+
+    m, n = shape
+    bounds_r = R @ np.array([[0, 0, m, m], [0, n, 0, n]])
+    shape_r = (np.ptp(bounds_r, axis=1) + .5).astype(int)
+    offset = (np.array(shape) - 1) / 2 - R @ ((shape_r - 1) / 2)
+    return R, offset, tuple(shape_r)
+
+
+def make_doppler_range(Z, az, zn, Lambertian=True, spac=10, Sd=None):
     """
 
     Parameters
@@ -369,9 +428,18 @@ def make_doppler_range(Z, az, zn, Lambertian=True, spac=10):
         flight orientation of the satellite
     zn : {float,array},  unit=degrees, range=0...+90
         illumination angle from the satellite
+    Lambertian : bool, default=True
+        weight the range by a Lambertian shading
+    spac : float, default=10, unit=meter
+        resolution of the square grid.
+    Sd : numpy.array, size=(m,n), dtype=float
+        shading grid, if it is already at hand, otherwise it is estimated
 
     Returns
     -------
+    S_r : numpy.ndarray, size=(m_r,n_r), dtype=float
+        histogram of the range for every row of the grid, rotated towards the
+        flight orientation
 
     Notes
     -----
@@ -379,42 +447,47 @@ def make_doppler_range(Z, az, zn, Lambertian=True, spac=10):
 
     """
 
-    # rotate
-    Z_r = ndimage.rotate(Z, az, axes=(1, 0), cval=-1, order=3)
+    Z = np.asarray(Z, dtype=np.float32)  # single precision is sufficient
+
+    # rotate, all grids share the same transformation
+    R, offset, shape_r = _get_rotation_transform(Z.shape, az)
+    Z_r = ndimage.affine_transform(Z, R, offset, shape_r, cval=-1, order=3)
     # mask based
-    M_r = ndimage.rotate(np.ones_like(Z, dtype=bool),
-                         az,
-                         axes=(1, 0),
-                         cval=False,
-                         order=0,
-                         prefilter=False)
+    M_r = ndimage.affine_transform(np.ones_like(Z, dtype=bool),
+                                   R,
+                                   offset,
+                                   shape_r,
+                                   cval=False,
+                                   order=0,
+                                   prefilter=False)
 
-    K_r = np.fliplr(
-        np.meshgrid(np.linspace(0, M_r.shape[0] - 1, M_r.shape[0]),
-                    np.linspace(0, M_r.shape[1] - 1, M_r.shape[1]))[0])
-    np.putmask(K_r, ~M_r, 0)
+    # flipped column index, only within the rotated grid
+    k_r = np.arange(M_r.shape[1] - 1, -1, -1, dtype=Z_r.dtype)
 
-    D_r = np.multiply(np.cos(np.deg2rad(zn)), Z_r) + \
-        np.multiply(np.sin(np.deg2rad(zn)), K_r * spac)
+    D_r = np.multiply(M_r, np.sin(np.deg2rad(zn)) * spac * k_r)
+    D_r += np.multiply(np.cos(np.deg2rad(zn)), Z_r)
 
     if Lambertian:  # do a weighted histogram
-        Sd = make_shading(Z, az, zn, spac=10)
-        Sd_r = ndimage.rotate(Sd, az, axes=(1, 0), cval=-1, order=3)
+        if Sd is None:
+            Sd = make_shading(Z, az, zn, spac=spac)
+        Sd_r = ndimage.affine_transform(Sd,
+                                        R,
+                                        offset,
+                                        shape_r,
+                                        cval=-1,
+                                        order=3)
         np.putmask(Sd_r, ~M_r, 0)
 
-    # loop through the rows and create histogram
-    S_r = np.zeros_like(Z_r, dtype=float)
-    for i in range(Z_r.shape[0]):
-        if Lambertian:
-            his = np.histogram(D_r[i, :],
-                               bins=np.arange(0, K_r.shape[1] + 1),
-                               weights=Sd_r[i, :])[0]
-        else:
-            his = np.histogram(D_r[i, :],
-                               bins=np.arange(0, K_r.shape[1] + 1),
-                               weights=M_r[i, :].astype(float))[0]
-        S_r[i, :] = his
-    return
+    # create a histogram for every row, since the bins are unit intervals,
+    # this is a weighted count over the floored range per row
+    (m_r, n_r) = Z_r.shape
+    W_r = Sd_r if Lambertian else M_r.astype(float)
+    IN = (D_r >= 0) & (D_r <= n_r)
+    I_r = np.nonzero(IN)[0]
+    J_r = np.minimum(np.floor(D_r[IN]).astype(int), n_r - 1)
+    S_r = np.bincount(I_r * n_r + J_r, weights=W_r[IN],
+                      minlength=m_r * n_r).reshape(m_r, n_r)
+    return S_r
 
 
 def make_shading_minnaert(Z, az, zn, k=1, spac=10):
@@ -464,22 +537,15 @@ def make_shading_minnaert(Z, az, zn, k=1, spac=10):
     """
     if isinstance(spac, tuple):
         spac = get_max_pixel_spacing(spac)
-    sun = sun_angles_to_vector(az, zn, indexing='xy')
+    Z = np.asarray(Z, dtype=np.float32)  # single precision is sufficient
+    sun = sun_angles_to_vector(az, zn, indexing='xy').astype(np.float32)
 
     # estimate surface normals
-    dy, dx = np.gradient(Z * spac)
-
-    normal = np.dstack((dx, dy, np.ones_like(Z)))
-    n = np.linalg.norm(normal, axis=2)
-    normal[..., 0] /= n
-    normal[..., 1] /= n
-    normal[..., 2] /= n
+    dy, dx = np.gradient(Z * np.float32(spac))
 
-    L = normal[..., 0] * sun[..., 0] + \
-        normal[..., 1] * sun[..., 1] + \
-        normal[..., 2] * sun[..., 2]
+    L, n_z = _lambertian_from_gradient(dx, dy, sun)
     # assume overhead
-    Sh = L**(k + 1) * (1 - normal[..., 2])**(1 - k)
+    Sh = L**(k + 1) * (1 - n_z)**(1 - k)
     return Sh
 
 
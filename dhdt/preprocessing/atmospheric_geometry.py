@@ -1208,26 +1208,22 @@ def update_list_with_corr_zenith_pd(dh, file_dir, file_name='conn.txt'):
 
     dh_sel = dh[dh.columns.intersection(list(col_order))]
 
-    # write to file
-    f = open(os.path.join(file_dir, file_name), 'w')
-
-    # if timestamp is give, add this to the
-    print('# time: ' + timestamp, file=f)
-
-    # add header
     col_idx = dh_sel.columns.get_indexer(list(col_order))
     IN = col_idx != -1
-    print('# ' + ' '.join(tuple(np.array(col_order)[IN])), file=f)
+    header = '# ' + ' '.join(tuple(np.array(col_order)[IN]))
     col_idx = col_idx[IN]
 
-    # write rows of dataframe into text file
-    for k in range(dh_sel.shape[0]):
-        line = ''
-        for idx, val in enumerate(col_idx):
-            line += col_frmt[idx].format(dh_sel.iloc[k, val])
-            line += ' '
-        print(line[:-1], file=f)  # remove last spacer
-    f.close()
+    # format rows of dataframe, and write these all at once
+    lines = [
+        ' '.join(col_frmt[idx].format(row[val])
+                 for idx, val in enumerate(col_idx)) + '\n'
+        for row in dh_sel.itertuples(index=False, name=None)
+    ]
+    with open(os.path.join(file_dir, file_name), 'w') as f:
+        # if timestamp is give, add this to the
+        print('# time: ' + timestamp, file=f)
+        print(header, file=f)  # add header
+        f.writelines(lines)
     return
 
 
@@ -254,16 +254,18 @@ def rgb2hsi(Red, Green, Blue):
     if np.ptp(Blue.flatten()) > 1:
         Blue = mat_to_gray(Blue)
 
-    Tsai = np.array([(1 / 3, 1 / 3, 1 / 3),
-                     (-np.sqrt(6) / 6, -np.sqrt(6) / 6, -np.sqrt(6) / 3),
-                     (1 / np.sqrt(6), 2 / -np.sqrt(6), 0)])
-
-    RGB = np.dstack((Red, Green, Blue))
-    HSI = np.einsum('ij,klj->kli', Tsai, RGB)
-    Int = HSI[:, :, 0]
-    Sat = np.hypot(HSI[:, :, 1], HSI[:, :, 2])
-    Hue = np.arctan2(HSI[:, :, 1], HSI[:, :, 2]) / np.pi
-    Hue = np.remainder(Hue, 1)  # bring to from -.5...+.5 to 0...1 range
+    # rows of the transformation matrix of [Ts06], applied band-wise to avoid
+    # the construction of a (m,n,3) stack, buffers are re-used where possible
+    Int = (Red + Green + Blue) / 3
+    V1 = Blue * (-np.sqrt(6) / 6)  # -(R+G+2B)*sqrt(6)/6 = -(3I+B)*sqrt(6)/6
+    V1 -= Int * (np.sqrt(6) / 2)
+    V2 = Red / np.sqrt(6)
+    V2 -= Green * (2 / np.sqrt(6))
+
+    Sat = np.hypot(V1, V2)
+    Hue = np.arctan2(V1, V2, out=V1)
+    Hue /= np.pi
+    np.remainder(Hue, 1, out=Hue)  # bring to from -.5...+.5 to 0...1 range
     return Hue, Sat, Int
 
 
@@ -57,7 +57,7 @@ def get_shadow_bands(satellite_name):
     return band_num
 
 
-def read_shadow_bands(sat_path, band_num):
+def read_shadow_bands(sat_path, band_num, window=None):
     """ read the specific band numbers of the multispectral satellite images
 
     Parameters
@@ -71,6 +71,9 @@ def read_shadow_bands(sat_path, band_num):
         * band_num[2] : Red band number
         * band_num[3] : Near-infrared band number
         * band_num[4] : panchrometic band
+    window : tuple, size=(4,), optional
+        pixel bounds (minI, maxI, minJ, maxJ) of the subset to read, only
+        implemented for Sentinel-2 imagery
 
     Returns
     -------
@@ -102,13 +105,17 @@ def read_shadow_bands(sat_path, band_num):
     if len([n for n in ['S2', 'MSIL1C'] if n in sat_path]) == 2:
         # read imagery of the different bands
         (Blue, crs, geoTransform,
-         targetprj) = read_band_s2(format(band_num[0], '02d'), sat_path)
+         targetprj) = read_band_s2(
+             format(band_num[0], '02d'), sat_path, window=window)
         (Green, crs, geoTransform,
-         targetprj) = read_band_s2(format(band_num[1], '02d'), sat_path)
+         targetprj) = read_band_s2(
+             format(band_num[1], '02d'), sat_path, window=window)
         (Red, crs, geoTransform,
-         targetprj) = read_band_s2(format(band_num[2], '02d'), sat_path)
+         targetprj) = read_band_s2(
+             format(band_num[2], '02d'), sat_path, window=window)
         (Near, crs, geoTransform,
-         targetprj) = read_band_s2(format(band_num[3], '02d'), sat_path)
+         targetprj) = read_band_s2(
+             format(band_num[3], '02d'), sat_path, window=window)
         Pan = None
     elif len([n for n in ['RapidEye', 'RE'] if n in sat_path]) == 2:
         # read single imagery and extract the different bands
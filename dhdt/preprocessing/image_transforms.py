@@ -37,7 +37,6 @@ def mat_to_gray(Z, notZ=None, vmin=None, vmax=None):
     """
     if notZ is None:
         yesZ = np.ones(Z.shape, dtype=bool)
-        notZ = ~yesZ
     else:
         yesZ = ~notZ
     Znew = np.zeros_like(Z, dtype=np.float64)  # /2**16
@@ -50,8 +49,14 @@ def mat_to_gray(Z, notZ=None, vmin=None, vmax=None):
     if vmax is not None:
         Z[yesZ] = np.minimum(Z[yesZ], vmax)
 
-    Znew[yesZ] = np.interp(Z[yesZ], (Z[yesZ].min(), Z[yesZ].max()), (0, +1))
-    Znew[notZ] = 0
+    Zmin, Zmax = Z[yesZ].min(), Z[yesZ].max()
+    if Zmin == Zmax:  # constant data, behave as interpolation would do
+        Znew[yesZ] = 1
+        return Znew
+
+    # min-max scaling, done in-place on the output array
+    np.subtract(Z, Zmin, out=Znew, where=yesZ, dtype=np.float64)
+    np.multiply(Znew, 1 / (Zmax - Zmin), out=Znew, where=yesZ)
     return Znew
 
 
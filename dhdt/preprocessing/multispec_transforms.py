@@ -91,19 +91,21 @@ def principle_component_analysis(X):
     Returns
     -------
     eigen_vecs : numpy.ndarray, size=(b,b)
-        array with eigenvectors
+        array with eigenvectors, ordered along the collumns
     eigen_vals : numpy.ndarray, size=(b,1)
-        vector with eigenvalues
+        vector with eigenvalues, in descending order
 
     """
     assert isinstance(X, np.ndarray), 'please provide an array'
 
     # Data matrix X, assumes 0-centered
     n, m = X.shape
-    # Compute covariance matrix
+    # Compute covariance matrix, for the tall data used here (n >> m) this
+    # small matrix product is cheaper than a singular value decomposition of X
     C = np.dot(X.T, X) / (n - 1)
-    # Eigen decomposition
-    eigen_vals, eigen_vecs = np.linalg.eig(C)
+    # Eigen decomposition, the covariance matrix is symmetric
+    eigen_vals, eigen_vecs = np.linalg.eigh(C)
+    eigen_vals, eigen_vecs = np.flip(eigen_vals), np.flip(eigen_vecs, axis=1)
     return eigen_vecs, eigen_vals
 
 
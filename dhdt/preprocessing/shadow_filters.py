@@ -1,5 +1,5 @@
 import numpy as np
-from numpy.lib.stride_tricks import as_strided
+from numpy.lib.stride_tricks import as_strided, sliding_window_view
 from scipy import ndimage, signal
 from skimage.filters import threshold_otsu
 from sklearn.cluster import MeanShift, estimate_bandwidth
@@ -185,8 +185,38 @@ def iterative_median_filter(Z, tsize=5, loop=50):
     --------
     kuwahara_filter
     """
+    # after the first iterations only few pixels change, hence the median is
+    # then only re-evaluated in the vicinity of these changes
+    pad = (tsize // 2, tsize - 1 - tsize // 2)
+    rank, rim = tsize**2 // 2, tsize // 2
+    reach = np.ones((2 * rim + 1, 2 * rim + 1), dtype=bool)
+    update = np.ones_like(Z, dtype=bool)
     for i in range(loop):
-        Z = ndimage.median_filter(Z, size=tsize)
+        if np.count_nonzero(update) > .1 * update.size:
+            Z_new = ndimage.median_filter(Z, size=tsize)
+        else:
+            Z_new = Z.copy()
+            windows = sliding_window_view(np.pad(Z, pad, mode='symmetric'),
+                                          (tsize, tsize))
+            i_upd, j_upd = np.nonzero(update)
+            samples = windows[i_upd, j_upd].reshape(i_upd.size, -1)
+            Z_new[i_upd, j_upd] = np.partition(samples, rank, axis=1)[:, rank]
+
+        changed = Z_new != Z
+        Z = Z_new
+        # a repeated median converges to a root signal, which is invariant to
+        # further filtering, hence the remaining iterations can be skipped
+        if not np.any(changed):
+            break
+        update = ndimage.binary_dilation(changed, structure=reach)
+        # windows along the rim also see changes through the reflected border
+        rims = ((np.s_[:2 * rim], np.s_[:rim]),
+                (np.s_[-2 * rim:], np.s_[-rim:])) if rim > 0 else ()
+        for sl_chg, sl_upd in rims:
+            if np.any(changed[sl_chg, :]):
+                update[sl_upd, :] = True
+            if np.any(changed[:, sl_chg]):
+                update[:, sl_upd] = True
     return Z
 
 
@@ -1,13 +1,13 @@
 import glob
 import os
+from functools import lru_cache
 
 import numpy as np
-from rasterio.features import shapes  # for raster to polygon
 from scipy import ndimage  # for image filtering
 from scipy import special  # for trigonometric functions
 from scipy.interpolate import RegularGridInterpolator  # for interpolation
 from shapely.errors import TopologicalError  # for troubleshooting
-from shapely.geometry import LineString, Point, shape
+from shapely.geometry import LineString
 from skimage import color  # for labeling image
 from skimage import segmentation  # for superpixels
 from skimage.morphology import \
@@ -53,6 +53,15 @@ def estimate_surface_normals(Z, spac=10.):
     return normal
 
 
+@lru_cache(maxsize=4)
+def _read_dem(dem_path):
+    # imagery of the same tile share their elevation model, hence keep the
+    # last ones in memory, these are read-only
+    dem, crs, geoTransform, targetprj = read_geo_image(dem_path)
+    dem.flags.writeable = False
+    return dem, crs, geoTransform, targetprj
+
+
 def make_shadowing(dem_path,
                    dem_file,
                    im_path,
@@ -60,9 +69,15 @@ def make_shadowing(dem_path,
                    Zn=45.,
                    Az=-45.,
                    nodata=-9999,
-                   dtype=bool):
-    (dem_mask, crs_dem, geoTransform_dem,
-     targetprj_dem) = read_geo_image(os.path.join(dem_path, dem_file))
+                   dtype=bool,
+                   dem_mask=None,
+                   geoTransform_dem=None):
+    if dem_mask is None:
+        (dem_mask, crs_dem, geoTransform_dem,
+         targetprj_dem) = _read_dem(os.path.join(dem_path, dem_file))
+    else:  # elevation model is already in memory, e.g.: cropped to a bbox
+        assert geoTransform_dem is not None, \
+            ('please provide the geoTransform of the elevation model')
     if 'MSIL1C' in im_name:  # for Sentinel-2
         fname = os.path.join(im_path, im_name, '*B08.jp2')
         (crs_im, geoTransform_im, targetprj_im, rows, cols,
@@ -159,13 +174,21 @@ def make_shading(
         Zn=np.radians(45.),
         Az=np.radians(-45.),
         nodata=-9999,
+        dem_mask=None,
+        geoTransform_dem=None,
 ):
     """
-    make hillshading from elevation model and meta data of image file
+    make hillshading from elevation model and meta data of image file, the
+    elevation model can also be given directly through "dem_mask" and
+    "geoTransform_dem", then no file is read
 
     """
-    (dem_mask, crs_dem, geoTransform_dem,
-     targetprj_dem) = read_geo_image(os.path.join(dem_path, dem_file))
+    if dem_mask is None:
+        (dem_mask, crs_dem, geoTransform_dem,
+         targetprj_dem) = _read_dem(os.path.join(dem_path, dem_file))
+    else:  # elevation model is already in memory, e.g.: cropped to a bbox
+        assert geoTransform_dem is not None, \
+            ('please provide the geoTransform of the elevation model')
     if 'MSIL1C' in im_name:  # for Sentinel-2
         fname = os.path.join(im_path, im_name, '*B08.jp2')
         (crs_im, geoTransform_im, targetprj_im, rows, cols,
@@ -481,26 +504,20 @@ def shadow_image_to_list(M,
     sun_angles = interp(np.array([i, j]).T)
 
     # write to file
-    f = open(os.path.join(s2_path, out_name), 'w')
-    # add meta-data if given
-    if timestamp is not None:
-        print('# time: ' + timestamp, file=f)
-    if crs is not None:
-        print('# proj: ' + crs, file=f)
-
-    # add header
-    print('# caster_X caster_Y casted_X casted_Y azimuth zenith', file=f)
-    # write suntrace list to text file
-    for k in range(suntrace_list.shape[0]):
-        line = '{:+8.2f}'.format(suntrace_list[k, 0]) + ' '
-        line += '{:+8.2f}'.format(suntrace_list[k, 1]) + ' '
-        line += '{:+8.2f}'.format(suntrace_list[k, 2]) + ' '
-        line += '{:+8.2f}'.format(suntrace_list[k, 3]) + ' '
-        line += '{:+3.4f}'.format(sun_angles[k, 0]) + ' '
-        line += '{:+3.4f}'.format(sun_angles[k, 1])
-
-        print(line, file=f)
-    f.close()
+    with open(os.path.join(s2_path, out_name), 'w') as f:
+        # add meta-data if given
+        if timestamp is not None:
+            print('# time: ' + timestamp, file=f)
+        if crs is not None:
+            print('# proj: ' + crs, file=f)
+
+        # add header
+        print('# caster_X caster_Y casted_X casted_Y azimuth zenith', file=f)
+        # write suntrace list to text file, formatted all at once
+        np.savetxt(f,
+                   np.column_stack((suntrace_list[:, :4], sun_angles[:, :2])),
+                   fmt=('%+8.2f', ) * 4 + ('%+3.4f', ) * 2,
+                   delimiter=' ')
     return
 
 
@@ -525,25 +542,33 @@ def label_occluder_and_casted(labeling, sunAz):
     mL, nL = labeling.shape
     shadowIdx = np.zeros((mL, nL), dtype=np.int16)
 
-    inner = ndimage.morphology.binary_erosion(msk)
+    inner = ndimage.binary_erosion(msk)
 
-    bndOrient = cast_orientation(inner.astype(np.float), sunAz)
+    bndOrient = cast_orientation(inner.astype(np.float32), sunAz)
     del mL, nL, inner
 
-    labList = np.unique(labeling)
-    labList = labList[labList != 0]
-    for i in labList:
-        selec = labeling == i
-        labIdx = np.nonzero(selec)
-        labImin = np.min(labIdx[0])
-        labImax = np.max(labIdx[0])
-        labJmin = np.min(labIdx[1])
-        labJmax = np.max(labIdx[1])
-        subMsk = selec[labImin:labImax, labJmin:labJmax]
+    # boundaries of all polygons at once, that is, the pixels which have
+    # another label in their 4-connected neighbourhood
+    cross = ndimage.generate_binary_structure(2, 1)
+    bndAll = np.logical_or(
+        ndimage.minimum_filter(labeling, footprint=cross, mode='constant')
+        != labeling,
+        ndimage.maximum_filter(labeling, footprint=cross, mode='constant')
+        != labeling)
+
+    # bounding boxes of all polygons, found in one pass over the scene
+    labSlices = ndimage.find_objects(labeling)
+    for i, labSlice in enumerate(labSlices, start=1):
+        if labSlice is None:  # label not present
+            continue
+        labI, labJ = labSlice
+        labImin, labImax = labI.start, labI.stop
+        labJmin, labJmax = labJ.start, labJ.stop
+        subMsk = labeling[labImin:labImax, labJmin:labJmax] == i
 
         subOrient = np.sign(bndOrient[labImin:labImax, labJmin:labJmax])
 
-        subBound = subMsk ^ ndimage.morphology.binary_erosion(subMsk)
+        subBound = subMsk & bndAll[labImin:labImax, labJmin:labJmax]
         subOrient[~subBound] = 0  # remove other boundaries
 
         subAz = sunAz[labImin:labImax, labJmin:labJmax]  # [loc]
@@ -559,17 +584,20 @@ def label_occluder_and_casted(labeling, sunAz):
         cast = subOrient == -1
 
         m, n = subMsk.shape
-        print("For shadowpolygon #%s: Its size is %s by %s," +
-              " connecting %s pixels in total" % (i, m, n, len(ridgeI)))
+        print(("For shadowpolygon #%s: Its size is %s by %s," +
+               " connecting %s pixels in total") % (i, m, n, len(ridgeI)))
+
+        # direction of the sun at all occluders, evaluated at once
+        ridgeAz = subAz[ridgeI, ridgeJ]  # degrees [-180 180]
+        # flip axis to get from world into image coords
+        ridgeDI = -np.cos(np.radians(ridgeAz))
+        ridgeDJ = -np.sin(np.radians(ridgeAz))
 
         for x in range(len(ridgeI)):  # loop through all occluders
-            sunDir = subAz[ridgeI[x]][ridgeJ[x]]  # degrees [-180 180]
+            sunDir = ridgeAz[x]
 
             # Bresenham's line algorithm
-            dI = -np.cos(
-                np.radians(subAz[ridgeI[x]][ridgeJ[x]])
-            )  # -cos # flip axis to get from world into image coords
-            dJ = -np.sin(np.radians(subAz[ridgeI[x]][ridgeJ[x]]))  # -sin #
+            dI, dJ = ridgeDI[x], ridgeDJ[x]
             brd = 3  # add aditional cast borders to the suntrace
             if abs(sunDir) > 90:  # northern hemisphere
                 if dI > dJ:
@@ -646,38 +674,85 @@ def list_occluder_and_casted(labels, sunZn, sunAz, geoTransform):
     """
     msk = labels > 1
     labels = labels.astype(np.int32)
-    mskOrient = cast_orientation(msk.astype(np.float), sunAz)
-    mskOrient = np.sign(mskOrient)
+    mskOrient = cast_orientation(msk.astype(np.float32), sunAz)
 
-    castList = []
-    for shp, val in shapes(labels, mask=msk, connectivity=8):
-        if val == 0:
-            continue
+    # get ridge coordinates of all polygons at once, that is, the boundary
+    # pixels which have another label in their 3x3 neighbourhood
+    polyBoun = np.logical_or(
+        ndimage.minimum_filter(labels, size=3, mode='constant') != labels,
+        ndimage.maximum_filter(labels, size=3, mode='constant') != labels)
+    ridgeI, ridgeJ = np.nonzero(polyBoun & msk & (mskOrient > 0))
+    del polyBoun, mskOrient
+
+    ridgeAz, ridgeZn = sunAz[ridgeI, ridgeJ], sunZn[ridgeI, ridgeJ]
+    castI, castJ = trace_cast_along_polygon(labels, ridgeI, ridgeJ, ridgeAz)
+    OK = ~np.isnan(castI)
 
-        # get ridge coordinates
-        polygoon = shape(shp)
-        polyRast = labels == val  # select the polygon
-        polyInnr = ndimage.binary_erosion(polyRast, np.ones((3, 3),
-                                                            dtype=bool))
-        polyBoun = np.logical_xor(polyRast, polyInnr)
-        polyWhe = np.nonzero(polyBoun)
-        ridgIdx = mskOrient[polyWhe[0], polyWhe[1]] == 1
-        ridgeI = polyWhe[0][ridgIdx]
-        ridgeJ = polyWhe[1][ridgIdx]
-        del polyRast, polyInnr, polyBoun, polyWhe, ridgIdx
-
-        for idx, _ in enumerate(ridgeI):  # ridgeI:
-            castLine = find_polygon_intersect(ridgeI[idx], ridgeJ[idx],
-                                              polygoon,
-                                              sunAz[ridgeI[idx]][ridgeJ[idx]],
-                                              sunZn[ridgeI[idx]][ridgeJ[idx]],
-                                              geoTransform)
-            if castLine is not None:
-                castList.append(castLine)
-            del castLine
+    # transform to UTM and append to array
+    ridgeX, ridgeY = pix2map(geoTransform, ridgeI[OK], ridgeJ[OK])
+    castX, castY = pix2map(geoTransform, castI[OK], castJ[OK])
+    castList = list(
+        np.column_stack(
+            (ridgeX, ridgeY, castX, castY, ridgeAz[OK], ridgeZn[OK])))
     return castList
 
 
+def trace_cast_along_polygon(labels, ridge_i, ridge_j, sun_az):
+    """ march from caster pixels along the illumination direction through
+    their shadow polygon, until the ray leaves the polygon
+
+    Parameters
+    ----------
+    labels : numpy.ndarray, size=(m,n), dtype=integer
+        array with labelled polygons
+    ridge_i : numpy.ndarray, size=(k,), dtype=integer
+        row coordinates of the casting pixels
+    ridge_j : numpy.ndarray, size=(k,), dtype=integer
+        collumn coordinates of the casting pixels
+    sun_az : numpy.ndarray, size=(k,), unit=degrees
+        argument of the illumination at the casting pixels
+
+    Returns
+    -------
+    cast_i, cast_j : numpy.ndarray, size=(k,), dtype=float
+        image coordinates of the last location within the polygon, hence the
+        casted pixel. If the ray directly leaves the polygon, a NaN is given.
+
+    See Also
+    --------
+    find_polygon_intersect : vector based counterpart for a single caster
+    """
+    m, n = labels.shape[:2]
+    d_i, d_j = np.cos(np.radians(sun_az)), -np.sin(np.radians(sun_az))
+    poly_val = labels[ridge_i, ridge_j]
+
+    cast_i = np.full(ridge_i.shape, np.nan)
+    cast_j = np.full(ridge_i.shape, np.nan)
+
+    # all rays are walked simultaneously, with unit steps
+    active, step = np.arange(ridge_i.size), 0
+    while active.size:
+        step += 1
+        ray_i = ridge_i[active] + step * d_i[active]
+        ray_j = ridge_j[active] + step * d_j[active]
+        # a sample on a pixel border is taken in the direction of travel,
+        # so a ray that runs along the edge of a polygon leaves it directly
+        samp_i = np.where(d_i[active] < 0, np.ceil(ray_i - .5),
+                          np.floor(ray_i + .5)).astype(int)
+        samp_j = np.where(d_j[active] < 0, np.ceil(ray_j - .5),
+                          np.floor(ray_j + .5)).astype(int)
+
+        IN = (samp_i >= 0) & (samp_i < m) & (samp_j >= 0) & (samp_j < n)
+        IN[IN] = labels[samp_i[IN], samp_j[IN]] == poly_val[active[IN]]
+
+        if step > 1:  # the ray has been within the polygon
+            left = active[~IN]
+            cast_i[left] = ray_i[~IN] - d_i[left]
+            cast_j[left] = ray_j[~IN] - d_j[left]
+        active = active[IN]
+    return cast_i, cast_j
+
+
 def find_polygon_intersect(ridge_i, ridge_j, polygoon, sun_az, sun_zn,
                            geoTransform):
     """
@@ -742,11 +817,10 @@ def find_polygon_intersect(ridge_i, ridge_j, polygoon, sun_az, sun_zn,
         return
 
     # find closest intersection
-    occluder = Point(ridge_j, ridge_i)
-    dists = [Point(c).distance(occluder) for c in castEnd]
-    dists = [float('Inf') if i == 0 else i for i in dists]
-    castIdx = dists.index(min(dists))
-    casted = castEnd[castIdx]
+    castEnd = np.asarray(castEnd, dtype=np.float64)
+    dists = np.hypot(castEnd[:, 0] - ridge_j, castEnd[:, 1] - ridge_i)
+    dists[dists == 0] = np.inf
+    casted = castEnd[np.argmin(dists)]
 
     # transform to UTM and append to array
     ridge_x, ridge_y = pix2map(geoTransform, ridge_i, ridge_j)
@@ -60,7 +60,7 @@ def compute_laplacian(img, mask=None, eps=10**(-7), win_rad=1):
     win_inds = win_inds.reshape(c_h, c_w, win_size)
     if mask is not None:
         dil_mat = np.ones((win_diam, win_diam), dtype=bool)
-        mask = ndimage.morphology.binary_dilation(mask, structure=dil_mat)
+        mask = ndimage.binary_dilation(mask, structure=dil_mat)
         win_mask = np.sum(mask.ravel()[win_inds], axis=2)
         win_inds = win_inds[win_mask > 0, :]
     else:
@@ -823,10 +823,14 @@ def shadow_index_liu(Blue, Green, Red):
 
     _, Sat, Int = rgb2hsi(Red, Green, Blue)
 
-    X = pca_rgb_preparation(Red, Green, Blue, min_samp=1e4)
+    X = pca_rgb_preparation(Blue, Green, Red, min_samp=1e4)
     e, lamb = principle_component_analysis(X)
     del X
-    PC1 = e[0, 0] * Red + e[0, 1] * Green + e[0, 2] * Blue
+    # leading eigenvector, its components are ordered as the columns of X,
+    # i.e.: red, green and blue. Its sign is arbitrary, thus fix it so PC1
+    # decreases with brightness
+    e *= -np.sign(np.sum(e[:, 0]))
+    PC1 = e[0, 0] * Red + e[1, 0] * Green + e[2, 0] * Blue
 
     denom = (PC1 + Int + Sat)
     SI = np.divide((PC1 - Int) * (1 + Sat), denom, where=denom != 0)
@@ -896,10 +900,14 @@ def shadow_detector_index(Blue, Green, Red):
     """
     are_three_arrays_equal(Blue, Green, Red)
 
-    X = pca_rgb_preparation(Red, Green, Blue, min_samp=1e4)
+    X = pca_rgb_preparation(Blue, Green, Red, min_samp=1e4)
     e, lamb = principle_component_analysis(X)
     del X
-    PC1 = e[0, 0] * Red + e[0, 1] * Green + e[0, 2] * Blue
+    # leading eigenvector, its components are ordered as the columns of X,
+    # i.e.: red, green and blue. Its sign is arbitrary, thus fix it so PC1
+    # decreases with brightness
+    e *= -np.sign(np.sum(e[:, 0]))
+    PC1 = e[0, 0] * Red + e[1, 0] * Green + e[2, 0] * Blue
 
     denom = ((Green - Blue) * Red) + 1
     SDI = np.divide((1 - PC1) + 1, denom, where=denom != 0)
@@ -1283,22 +1291,17 @@ def shadow_probabilities(Blue, Green, Red, Near, **kwargs):
 
     ae = kwargs.get('ae')
     if ae is None:
-        ae = signature(s_curve).parameters['ae'].default
-    be = kwargs.get('ae')
+        ae = signature(s_curve).parameters['a'].default
+    be = kwargs.get('be')
     if be is None:
-        be = signature(s_curve).parameters['be'].default
+        be = signature(s_curve).parameters['b'].default
 
-    Fk = np.amax(np.stack((Red, Green, Blue), axis=2), axis=2)
-    F = np.divide(np.clip(Fk, 0, 2), 2)  # (10) in [FS10]
-    L = np.divide(Red + Green + Blue, 3)  # (4) in [FS10]
-    del Red, Green, Blue, Fk
+    # the intermediate products are accumulated into a single output array
+    M = s_curve(1 - (Red + Green + Blue) / 3, ae, be)  # (4) & (5) in [FS10]
+    M *= s_curve(1 - Near, ae, be)  # (6) in [FS10]
 
-    Dvis = s_curve(1 - L, ae, be)
-    Dnir = s_curve(1 - Near, ae, be)  # (5) in [FS10]
-    D = np.multiply(Dvis, Dnir)  # (6) in [FS10]
-    del L, Near, Dvis, Dnir
-
-    M = np.multiply(D, (1 - F))
+    Fk = np.maximum(np.maximum(Red, Green), Blue)
+    M *= 1 - np.clip(Fk, 0, 2) / 2  # (10) in [FS10]
     return M
 
 # recovery - normalized color composite
@@ -1,12 +1,14 @@
 import os
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 import numpy as np
 import pandas as pd
 from numpy.lib.recfunctions import merge_arrays, stack_arrays
 from scipy import ndimage
+from scipy.spatial import cKDTree
 from scipy.spatial.distance import cdist
-from sklearn.neighbors import NearestNeighbors
 from tqdm import tqdm
 
 from dhdt.generic.handler_im import select_boi_from_stack
@@ -501,8 +503,8 @@ def couple_pair(file_1,
         scale_12, simple_sh = get_shadow_rectification(caster, post_1, post_2,
                                                        az_1, az_2)
     else:  # start with rigid displacement
-        scale_12 = np.ones((np.shape(post_1)[0]))
-        simple_sh = np.zeros((np.shape(post_1)[0]))
+        scale_12 = np.ones(post_1.shape[0])
+        simple_sh = np.zeros(post_1.shape[0])
 
     post_2_new, score = match_shadow_casts(I1,
                                            I2,
@@ -544,6 +546,36 @@ def couple_pair(file_1,
     )
 
 
+def couple_pairs(files_1, files_2, max_workers=None, **kwargs):
+    """ couple several image pairs, where each pair is processed in a
+    separate process
+
+    Parameters
+    ----------
+    files_1, files_2 : list of strings
+        paths to the first and second image(ry) of each pair
+    max_workers : integer, default=None
+        amount of processes to use, when None all cores are used
+    **kwargs
+        settings passed on to "couple_pair"
+
+    Returns
+    -------
+    list of tuples
+        output of "couple_pair" for each pair, in the same order as given
+
+    See Also
+    --------
+    couple_pair
+    """
+    assert len(files_1) == len(files_2), ('lists should be of equal length')
+    # pairs are independent of each other, hence can run side by side
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pairs = list(
+            executor.map(partial(couple_pair, **kwargs), files_1, files_2))
+    return pairs
+
+
 def create_template_at_center(Z, i, j, radius, filling='random'):
     """ get sub template of data array, at a certain location
 
@@ -761,11 +793,14 @@ def pair_images(conn_1, conn_2, thres=20):
     >>> plt.show()
 
     """
-    nbrs = NearestNeighbors(n_neighbors=1, algorithm='auto').fit(conn_1[:,
-                                                                        0:2])
-    distances, indices = nbrs.kneighbors(conn_2[:, 0:2])
+    tree = cKDTree(conn_1[:, 0:2])
+    # points beyond the search range get an infinite distance
+    distances, indices = tree.query(conn_2[:, 0:2],
+                                    k=1,
+                                    distance_upper_bound=thres,
+                                    workers=-1)
     IN = distances < thres
-    idxConn = np.transpose(np.vstack((np.where(IN)[0], indices[IN])))
+    idxConn = np.column_stack((np.flatnonzero(IN), indices[IN]))
     return idxConn
 
 
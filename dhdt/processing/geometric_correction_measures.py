@@ -1,5 +1,8 @@
+from math import comb
+
 import numpy as np
-from scipy.stats import spearmanr, ttest_1samp, wilcoxon
+from scipy.spatial.distance import cdist
+from scipy.stats import ttest_1samp, wilcoxon
 
 from dhdt.generic.unit_conversion import deg2compass
 
@@ -9,14 +12,6 @@ def doubling_the_angles(θ):
     return ψ
 
 
-def _nchoosek(n, k):
-    if k == 0:
-        r = 1
-    else:
-        r = n / k * _nchoosek(n - 1, k - 1)
-    return round(r)
-
-
 def ajne_test(dXY, α=0.05):
     """ implementing the Hodges-Ajne test, see also [BP97]_ for implementation
     details. Hence, the direction of the misfits are uniformly distributed.
@@ -39,21 +34,24 @@ def ajne_test(dXY, α=0.05):
     .. [Ho55] Hodges, "A bivariate sign test." The annals of mathematical
               statistics vol.26(3) pp.523-527, 1955.
     """
-    ψ = doubling_the_angles(np.rad2deg(np.angle(dXY[:, 0] + 1j * dXY[:, 0])))
+    ψ = doubling_the_angles(np.rad2deg(np.angle(dXY[:, 0] + 1j * dXY[:, 1])))
     n = ψ.size
 
+    # count the points on one side of a line through the origin, for all
+    # orientations of this line at once
     deg = np.linspace(0, 359, 360)
-    m1 = np.zeros((n))
-    for i, θ in enumerate(deg):
-        m1[i, ...] = np.sum(((α > θ) & (α < 360 + α)))
+    dψ = np.mod(ψ[np.newaxis, :] - deg[:, np.newaxis], 360)
+    m1 = np.sum((dψ > 0) & (dψ < 180), axis=1)
     m2 = n - m1
-    m = np.stack((m1, m2)).ravel().min()
+    m = np.minimum(m1, m2).min()
+    if n == 2 * m:  # perfectly balanced
+        return 1.
     if n < 50:  # use [Aj68]_
         A = np.pi * np.sqrt(n) / 2 / (n - 2 * m)
-        p_val = np.divide(np.sqrt(2 * np.pi), A * np.exp(-np.pi**2 / 8 / A**2))
+        p_val = np.sqrt(2 * np.pi) / A * np.exp(-np.pi**2 / 8 / A**2)
     else:  # use [Ho55]_
-        p_val = 2**(1 - n) * (n - 2 * m) * _nchoosek(n, m)
-    return p_val
+        p_val = 2**(1 - n) * (n - 2 * m) * comb(n, int(m))
+    return min(p_val, 1.)
 
 
 def moore_test(dXY):
@@ -268,11 +266,13 @@ def skew_distribution(dXY):
               geometric correction process quality", IEEE geoscience and remote
               sensing letters, vol.6(2) pp.292-296, 2009.
     """
-    n = dXY.shape[1]
-    if n < 20:  # Spearman
-        Skew = spearmanr(dXY[:, 0], dXY[:, 1])[0]
+    n = dXY.shape[0]
+    if n < 20:  # Spearman, that is Pearson on the ranks
+        r, s = np.argsort(np.argsort(dXY[:, 0])), \
+            np.argsort(np.argsort(dXY[:, 1]))
+        Skew = np.corrcoef(r, s)[0, 1]
     else:  # Pearson
-        Skew = np.corrcoef(dXY[:, 0], dXY[:, 1])
+        Skew = np.corrcoef(dXY[:, 0], dXY[:, 1])[0, 1]
     return Skew
 
 
@@ -299,16 +299,13 @@ def scat_distribution(XY, XY_dim):
     """
     r = .5 * np.mean(XY_dim)
 
-    # compute distances
-    xy = XY[:, 0] + 1j * XY[:, 1]
-    xy_1, xy_2 = np.meshgrid(xy, xy)
-    dxy = np.abs(xy_1 - xy_2)
-
-    # look at statistics of the neighborhood
-    n = XY.shape[1]
-    D = np.eye(n).astype(bool)
-    dxy[D] = np.nan
-    dist = np.nanmean(dxy, axis=1)
+    # compute mean distance towards all other points, this is done in blocks
+    # so the full distance matrix is never stored
+    n, b = XY.shape[0], 256
+    dist = np.zeros(n)
+    for i in range(0, n, b):
+        dist[i:i + b] = np.sum(cdist(XY[i:i + b, :], XY), axis=1)
+    dist /= n - 1  # the distance to itself is zero
 
     if n < 30:  # Wilcoxon
         res = wilcoxon(dist)
@@ -1,8 +1,6 @@
 import numpy as np
 from scipy import ndimage
 
-from .coupling_tools import (create_template_at_center,
-                             create_template_off_center)
 from .matching_tools import pad_radius
 
 
@@ -49,29 +47,25 @@ def fast_noise_estimation(Z, t_size, grd_i, grd_j, Gaussian=True):
     grd_i += t_rad[0]
     grd_j += t_rad[1]
 
-    # single pixel esitmation
-    N = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]])
+    # single pixel esitmation, the kernel [[1,-2,1],[-2,4,-2],[1,-2,1]] is
+    # separable, hence two one dimensional passes are used
+    N = np.array([1, -2, 1])
+    S = ndimage.convolve1d(ndimage.convolve1d(Z, N, axis=0), N, axis=1)
 
     if Gaussian is True:
-        S = ndimage.convolve(Z, N)**2
+        np.square(S, out=S)
         preamble = 1 / (36 * (t_size[0] - 2) * (t_size[1] - 2))
     else:
-        S = ndimage.convolve(Z, N)
         preamble = np.sqrt(np.pi / 2) / (6 * (t_size[0] - 2) * (t_size[1] - 2))
 
-    (m, n) = grd_i.shape
-    grd_i, grd_j = grd_i.flatten(), grd_j.flatten()
-    L = np.zeros_like(grd_i, dtype=float)
+    # all templates have the same size, thus sum over all pixels at once
     if np.any(np.mod(t_size, 2)):  # central template
-        for idx, i_coord in enumerate(grd_i):
-            S_sub = create_template_at_center(S, i_coord, grd_j[idx], t_rad)
-            L[idx] = np.sum(S_sub) * preamble
+        w_size = (2 * t_rad[0] + 1, 2 * t_rad[1] + 1)
     else:  # off-center template
-        for idx, i_coord in enumerate(grd_i):
-            S_sub = create_template_off_center(S, i_coord, grd_j[idx], t_rad)
-            L[idx] = np.sum(S_sub) * preamble
-
-    return L.reshape(m, n)
+        w_size = t_size
+    S = ndimage.uniform_filter(S, size=w_size, output=float, mode='constant')
+    L = S[grd_i, grd_j] * (w_size[0] * w_size[1] * preamble)
+    return L
 
 
 # foerstner & Haralick Shapiro, color
@@ -125,9 +119,9 @@ def geom_mean(sig_xx, sig_yy):
               Statistics, geometry, orientation and reconstruction", Series on
               geometry and computing vol.11. pp.366, 2016.
     """
-    sig_xxyy = np.multiply(sig_xx, sig_yy)
-    L = np.power(sig_xxyy,
-                 .25,
-                 out=np.zeros_like(sig_xxyy),
-                 where=sig_xxyy > 0)
+    L = np.multiply(sig_xx, sig_yy)
+    L[~(L > 0)] = 0
+    # fourth root, done via two square roots, which are cheaper than a power
+    np.sqrt(L, out=L)
+    np.sqrt(L, out=L)
     return L
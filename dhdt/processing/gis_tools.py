@@ -6,6 +6,12 @@ from osgeo import gdal, ogr, osr
 from ..generic.mapping_io import read_geo_info
 
 
+def _is_shapefile_up_to_date(shp_path, txt_path):
+    # a shapefile newer than its text file does not need to be made again
+    return os.path.isfile(shp_path) and \
+        (os.path.getmtime(shp_path) >= os.path.getmtime(txt_path))
+
+
 def make_casting_couple_shapefile(fpath):
     """
     make shapefile, to be used in a GIS for analysis
@@ -16,20 +22,22 @@ def make_casting_couple_shapefile(fpath):
 
     fdir, fname = os.path.split(fpath)
     oname = fname[:-3] + 'shp'
+    if _is_shapefile_up_to_date(os.path.join(fdir, oname), fpath):
+        return
 
-    # get metadata
-    f = open(fpath, 'r')
-    crs = f.readlines(1)[0][:-1]
-    f.close()
-
-    xy_list = np.loadtxt(fname=fpath, skiprows=1)
+    # get metadata, and parse the coordinates from the same file handle
+    with open(fpath, 'r') as f:
+        crs = f.readline().rstrip('\n')
+        xy_list = np.loadtxt(f, dtype=np.float64, ndmin=2)
 
     # set up the shapefile driver
     driver = ogr.GetDriverByName('ESRI Shapefile')
     # create the spatial reference, WGS84
     spatialRef = osr.SpatialReference()
     spatialRef.ImportFromWkt(crs)  # hardcoded
-    # create the output layer
+    # create the output layer, while removing an outdated version
+    if os.path.isfile(os.path.join(fdir, oname)):
+        driver.DeleteDataSource(os.path.join(fdir, oname))
     dataSet = driver.CreateDataSource(os.path.join(fdir, oname))
     # create the layer
     layer = dataSet.CreateLayer("castlines",
@@ -70,6 +78,8 @@ def make_conn_txt_a_shapefile(fpath):
 
     fdir, fname = os.path.split(fpath)
     oname = fname[:-3] + 'shp'  # output name
+    if _is_shapefile_up_to_date(os.path.join(fdir, oname), fpath):
+        return
 
     # get metadata
     crs, _, _, _, _, _ = read_geo_info(os.path.join(fdir, 'shadow.tif'))
@@ -81,7 +91,9 @@ def make_conn_txt_a_shapefile(fpath):
     # create the spatial reference, WGS84
     spatialRef = osr.SpatialReference()
     spatialRef.ImportFromWkt(crs)  # hardcoded
-    # create the output layer
+    # create the output layer, while removing an outdated version
+    if os.path.isfile(os.path.join(fdir, oname)):
+        driver.DeleteDataSource(os.path.join(fdir, oname))
     dataSet = driver.CreateDataSource(os.path.join(fdir, oname))
     # create the layer
     layer = dataSet.CreateLayer("castlines",
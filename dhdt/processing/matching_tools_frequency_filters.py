@@ -1,4 +1,5 @@
 import warnings
+from functools import lru_cache
 
 import numpy as np
 from scipy import fft, interpolate, ndimage, signal
@@ -7,6 +8,37 @@ from ..generic.unit_conversion import deg2compass
 # frequency preparation
 from ..preprocessing.image_transforms import mat_to_gray
 
+# precision of the spectral weighting filters
+FILTER_DTYPE = np.float32
+
+# threading of the Fourier transforms, which only pays off for large grids.
+# Smaller transforms use the workers of the scipy.fft context, which is one
+# by default, while the element-wise filters are memory-bound and are kept
+# single-threaded
+FFT_WORKERS = -1
+FFT_WORKERS_MIN_SIZE = 256 * 256
+
+
+def set_fft_workers(workers=-1, min_size=256 * 256):
+    """ set the threading policy of the Fourier transforms in this module
+
+    Parameters
+    ----------
+    workers : integer, default=-1
+        number of workers for large transforms, negative values count back
+        from the number of available cpus
+    min_size : integer, default=256*256
+        number of grid elements from which a transform is threaded
+    """
+    global FFT_WORKERS, FFT_WORKERS_MIN_SIZE
+    FFT_WORKERS, FFT_WORKERS_MIN_SIZE = workers, min_size
+
+
+def _get_fft_workers(m, n):
+    if (m * n) < FFT_WORKERS_MIN_SIZE:
+        return None
+    return FFT_WORKERS
+
 
 def perdecomp(img):
     """calculate the periodic and smooth components of an image, based upon
@@ -46,41 +78,47 @@ def perdecomp(img):
     if (0 in img.shape):
         return img, np.zeros_like(img)
 
-    img = img.astype(float)
-    if img.ndim == 2:
-        (m, n) = img.shape
-        per = np.zeros((m, n), dtype=float)
-
-        per[+0, :] = +img[0, :] - img[-1, :]
-        per[-1, :] = -per[0, :]
-
-        per[:, +0] = per[:, +0] + img[:, +0] - img[:, -1]
-        per[:, -1] = per[:, -1] - img[:, +0] + img[:, -1]
-
-    elif img.ndim == 3:
-        (m, n, b) = img.shape
-        per = np.zeros((m, n, b), dtype=float)
+    # single precision is kept, otherwise double precision is used
+    img = img.astype(np.float32 if img.dtype == np.float32 else float)
+    (m, n) = img.shape[:2]
+    tail = (1, ) * (img.ndim - 2)  # dimensions of the bands, if present
+
+    # the border image is only non-zero along its edges, thus its spectrum
+    # is composed of the one-dimensional spectra of these edges. Since it
+    # is real, only the half-spectrum is needed
+    u_x, u_y, D = _perdecomp_factors(m, n, img.dtype)
+    S_x = fft.rfft(img[0, ...] - img[-1, ...], axis=0)
+    S_y = fft.fft(img[:, 0, ...] - img[:, -1, ...], axis=0)
+    S = u_y.reshape((m, 1) + tail) * S_x[np.newaxis, ...]
+    S += S_y[:, np.newaxis, ...] * u_x.reshape((1, n // 2 + 1) + tail)
+    S *= D.reshape(D.shape + tail)
+    cor = fft.irfft2(S, s=(m, n), axes=(0, 1), workers=_get_fft_workers(m, n))
+    if type(img) in (np.ma.core.MaskedArray, ):
+        per = img - cor
+    else:  # the image is a copy already, hence its buffer can be re-used
+        per = np.subtract(img, cor, out=img)
+    return per, cor
 
-        per[+0, :, :] = +img[0, :, :] - img[-1, :, :]
-        per[-1, :, :] = -per[0, :, :]
 
-        per[:, +0, :] = per[:, +0, :] + img[:, +0, :] - img[:, -1, :]
-        per[:, -1, :] = per[:, -1, :] - img[:, +0, :] + img[:, -1, :]
+@lru_cache(maxsize=32)
+def _perdecomp_factors(m, n, dtype=np.float64):
+    # spectral factors of perdecomp, which only depend upon the image size
+    u_x = 1 - np.exp(2j * np.pi * np.arange(0, n // 2 + 1) / n)
+    u_y = 1 - np.exp(2j * np.pi * np.arange(0, m) / m)
 
     fy = np.cos(2 * np.pi * (np.arange(0, m)) / m)
-    fx = np.cos(2 * np.pi * (np.arange(0, n)) / n)
-
-    Fx = np.repeat(fx[np.newaxis, :], m, axis=0)
-    Fy = np.repeat(fy[:, np.newaxis], n, axis=1)
-    Fx[0, 0] = 0
-    if img.ndim == 3:
-        Fx = np.repeat(Fx[:, :, np.newaxis], b, axis=2)
-        Fy = np.repeat(Fy[:, :, np.newaxis], b, axis=2)
-        cor = np.real(np.fft.ifftn(np.fft.fft2(per) * .5 / (2 - Fx - Fy)))
-    else:
-        cor = np.real(np.fft.ifft2(np.fft.fft2(per) * .5 / (2 - Fx - Fy)))
-    per = img - cor
-    return per, cor
+    fx = np.cos(2 * np.pi * (np.arange(0, n // 2 + 1)) / n)
+
+    D = 2 - fy[:, np.newaxis] - fx[np.newaxis, :]
+    D[0, 0] = np.inf  # the smooth component has zero mean
+    np.reciprocal(D, out=D)
+    D *= .5
+    u_x, u_y = u_x.astype(np.result_type(dtype, np.complex64)), \
+        u_y.astype(np.result_type(dtype, np.complex64))
+    D = D.astype(dtype)
+    for arr in (u_x, u_y, D):
+        arr.flags.writeable = False
+    return u_x, u_y, D
 
 
 def make_template_float(Z):
@@ -129,7 +167,11 @@ def normalize_power_spectrum(Q):
 
     """
     assert isinstance(Q, np.ndarray), "please provide an array"
-    Qn = np.divide(Q, abs(Q), out=np.zeros_like(Q), where=Q != 0)
+    Q_abs = np.abs(Q)
+    # zero elements remain zero after scaling, hence no masking is needed
+    np.maximum(Q_abs, np.finfo(Q_abs.dtype).tiny, out=Q_abs)
+    np.reciprocal(Q_abs, out=Q_abs)
+    Qn = Q * Q_abs
     return Qn
 
 
@@ -174,19 +216,19 @@ def local_coherence(Q, ds=1):
     assert isinstance(Q, np.ndarray), "please provide an array"
 
     diam = 2 * ds + 1
-    C = np.zeros_like(Q)
-    isteps, jsteps = np.meshgrid(np.linspace(-ds, +ds, 2 * ds + 1, dtype=int),
-                                 np.linspace(-ds, +ds, 2 * ds + 1, dtype=int))
-    IN = np.ones(diam**2, dtype=bool)
-    IN[diam**2 // 2] = False
-    isteps, jsteps = isteps.flatten()[IN], jsteps.flatten()[IN]
-
-    for idx, istep in enumerate(isteps):
-        jstep = jsteps[idx]
-        Q_step = np.roll(Q, (istep, jstep))
-        # if the spectrum is normalized, then no division is needed
-        C += Q * np.conj(Q_step)
-    C = np.abs(C) / np.sum(IN)
+    (m, n) = Q.shape[:2]
+    # sum over the wrapped neighborhood, through shifted slices of the padded
+    # array, which are accumulated in place for each axis separately
+    Q_pad = np.pad(Q, ds, mode='wrap')
+    R = Q_pad[:m, :].copy()
+    for i in range(1, diam):
+        R += Q_pad[i:i + m, :]
+    C = R[:, :n].copy()
+    for j in range(1, diam):
+        C += R[:, j:j + n]
+    C -= Q  # exclude the center itself
+    # if the spectrum is normalized, then no division is needed
+    C = np.abs(Q * np.conj(C)) / (diam**2 - 1)
     return C
 
 
@@ -254,24 +296,27 @@ def make_fourier_grid(Q,
     assert type(Q) in (np.ma.core.MaskedArray, np.ndarray), \
         "please provide an array"
     m, n = Q.shape
+    return _make_fourier_grid(m, n, indexing, system, shift, axis)
+
+
+@lru_cache(maxsize=32)
+def _make_fourier_grid(m, n, indexing, system, shift, axis):
+    """ construct the grid of make_fourier_grid, these are kept in memory as
+    spectra of the same size are often used, hence the grids are read-only
+    """
+    # the grid is separable, hence only construct its axes, and broadcast
     if indexing == 'ij':
-        if axis in ('center', ):
-            (I_grd, J_grd) = np.meshgrid(np.arange(0, m),
-                                         np.arange(0, n),
-                                         indexing='ij')
-        else:
-            (I_grd, J_grd) = np.meshgrid(np.arange(0, m) - (m // 2),
-                                         np.arange(0, n) - (n // 2),
-                                         indexing='ij')
-        F_1, F_2 = I_grd / m, J_grd / n
+        f_1, f_2 = np.arange(0, m), np.arange(0, n)
+        if axis not in ('center', ):
+            f_1, f_2 = f_1 - (m // 2), f_2 - (n // 2)
+        F_1, F_2 = f_1[:, np.newaxis] / m, f_2[np.newaxis, :] / n
     else:
-        fy, fx = np.linspace(0, m, m), np.linspace(0, n, n)
+        # the vertical axis is descending, constructed so directly
+        fy, fx = np.linspace(m, 0, m), np.linspace(0, n, n)
         if axis in ('center', ):
             fy, fx = fy - (m // 2), fx - (n // 2)
-        fy, fx = np.flip(fy) / m, fx / n
-
-        F_1 = np.repeat(fx[np.newaxis, :], m, axis=0)
-        F_2 = np.repeat(fy[:, np.newaxis], n, axis=1)
+        fy, fx = fy / m, fx / n
+        F_1, F_2 = fx[np.newaxis, :], fy[:, np.newaxis]
 
     if system == 'radians':  # what is the range of the axis
         F_1 *= 2 * np.pi
@@ -284,9 +329,22 @@ def make_fourier_grid(Q,
         F_2 *= 2
     if shift:
         F_1, F_2 = np.fft.fftshift(F_1), np.fft.fftshift(F_2)
+    # views with the size of the spectrum, these are read-only
+    F_1, F_2 = np.broadcast_to(F_1, (m, n)), np.broadcast_to(F_2, (m, n))
     return F_1, F_2
 
 
+@lru_cache(maxsize=32)
+def _make_fourier_radius(m, n, shift=True):
+    """ radius of the normalized Fourier grid, as used by the circular
+    filters, this is also kept in memory and is read-only
+    """
+    Fx, Fy = _make_fourier_grid(m, n, 'xy', 'normalized', shift, 'center')
+    R = np.hypot(Fx[:1, :], Fy[:, :1])
+    R.flags.writeable = False
+    return R
+
+
 def construct_phase_plane(Z, di, dj, indexing='ij'):
     """given a displacement, create what its phase plane in Fourier space
 
@@ -444,8 +502,10 @@ def gradient_fourier(Z):
     I_g = perdecomp(Z)[0]
     W_1, W_2 = hanning_window(K_1), hanning_window(K_2)
 
-    dZdx_1 = np.fft.ifftn(W_1 * K_1 * 1j * np.fft.fftn(Z)).real
-    dZdx_2 = np.fft.ifftn(W_2 * K_2 * 1j * np.fft.fftn(Z)).real
+    workers = _get_fft_workers(m, n)
+    S = fft.fft2(Z, workers=workers)
+    dZdx_1 = fft.ifft2(W_1 * K_1 * 1j * S, workers=workers).real
+    dZdx_2 = fft.ifft2(W_2 * K_2 * 1j * S, workers=workers).real
     return dZdx_1, dZdx_2
 
 
@@ -495,21 +555,32 @@ def raised_cosine(Z, beta=0.35):
     >>> Qn = normalize_spectrum(Q)    
     """  # noqa: E501
     assert isinstance(Z, np.ndarray), "please provide an array"
-    (m, n) = Z.shape
-
-    Fx, Fy = make_fourier_grid(Z, indexing='xy', system='normalized')
-    R = np.hypot(Fx, Fy)  # radius
-    # filter formulation
-    Hamm = np.cos((np.pi / (2 * beta)) * (R - (.5 - beta)))**2
-    selec = np.logical_and((.5 - beta) <= R, R <= .5)
 
-    # compose filter
-    W = np.zeros((m, n))
-    W[(.5 - beta) > R] = 1
-    W[selec] = Hamm[selec]
+    R = _make_fourier_radius(*Z.shape)  # radius
+    # position within the roll-off, i.e.: 0...1, which is clipped so the
+    # pass- and stop-band follow from the same expression
+    W = np.subtract(R, .5 - beta, dtype=FILTER_DTYPE)
+    W /= beta
+    np.clip(W, 0, 1, out=W)
+
+    # filter formulation, i.e.: cos²(π/2·t) = ½ + ½·cos(π·t)
+    W *= np.pi
+    np.cos(W, out=W)
+    W += 1
+    W *= .5
     return W
 
 
+@lru_cache(maxsize=32)
+def _sqrt_window(window, n, *args):
+    # the square root and the shift are separable, hence apply them to the
+    # one-dimensional window, which can be shared between calls
+    w = np.fft.fftshift(np.sqrt(np.maximum(window(n, *args), 0)))
+    w = w.astype(FILTER_DTYPE)
+    w.flags.writeable = False
+    return w
+
+
 def hamming_window(Z):
     """ create two-dimensional Hamming filter
 
@@ -530,8 +601,7 @@ def hamming_window(Z):
     """
     assert isinstance(Z, np.ndarray), "please provide an array"
     m, n = Z.shape
-    W = np.sqrt(np.outer(np.hamming(m), np.hamming(n)))
-    W = np.fft.fftshift(W)
+    W = np.outer(_sqrt_window(np.hamming, m), _sqrt_window(np.hamming, n))
     return W
 
 
@@ -555,8 +625,7 @@ def hanning_window(Z):
     """
     assert isinstance(Z, np.ndarray), "please provide an array"
     m, n = Z.shape
-    W = np.sqrt(np.outer(np.hanning(m), np.hanning(n)))
-    W = np.fft.fftshift(W)
+    W = np.outer(_sqrt_window(np.hanning, m), _sqrt_window(np.hanning, n))
     return W
 
 
@@ -580,8 +649,7 @@ def blackman_window(Z):
     """
     assert isinstance(Z, np.ndarray), "please provide an array"
     m, n = Z.shape
-    W = np.sqrt(np.outer(np.blackman(m), np.blackman(n)))
-    W = np.fft.fftshift(W)
+    W = np.outer(_sqrt_window(np.blackman, m), _sqrt_window(np.blackman, n))
     return W
 
 
@@ -610,8 +678,8 @@ def kaiser_window(Z, beta=14.):
     """
     assert isinstance(Z, np.ndarray), "please provide an array"
     m, n = Z.shape
-    W = np.sqrt(np.outer(np.kaiser(m, beta), np.kaiser(n, beta)))
-    W = np.fft.fftshift(W)
+    W = np.outer(_sqrt_window(np.kaiser, m, beta),
+                 _sqrt_window(np.kaiser, n, beta))
     return W
 
 
@@ -642,10 +710,10 @@ def low_pass_rectancle(Z, r=0.50):
               pp.1925-1934, 2003.
     """
     assert isinstance(Z, np.ndarray), "please provide an array"
-    Fx, Fy = make_fourier_grid(Z, indexing='xy', system='normalized')
+    R_y, R_x = _low_pass_rectancle_axes(Z, r)
 
     # filter formulation
-    W = np.logical_and(np.abs(Fx) <= r, np.abs(Fy) <= r)
+    W = np.logical_and(R_y[:, np.newaxis], R_x[np.newaxis, :])
     return W
 
 
@@ -677,12 +745,8 @@ def low_pass_pyramid(Z, r=0.50):
               pp.1925-1934, 2003.
     """
     assert isinstance(Z, np.ndarray), "please provide an array"
-    R = low_pass_rectancle(Z, r)
-    W = signal.convolve2d(R.astype(float),
-                          R.astype(float),
-                          mode='same',
-                          boundary='wrap')
-    W = np.fft.fftshift(W / np.max(W))
+    T_y, T_x = _low_pass_pyramid_axes(Z, r)
+    W = np.outer(T_y.astype(FILTER_DTYPE), T_x.astype(FILTER_DTYPE))
     return W
 
 
@@ -714,14 +778,39 @@ def low_pass_bell(Z, r=0.50):
               pp.1925-1934, 2003.
     """
     assert isinstance(Z, np.ndarray), "please provide an array"
-    R1 = low_pass_rectancle(Z, r)
-    R2 = low_pass_pyramid(Z, r)
-    W = signal.convolve2d(R1.astype(float),
-                          R2.astype(float),
+    R_y, R_x = _low_pass_rectancle_axes(Z, r)
+    R_y, R_x = R_y.astype(float), R_x.astype(float)
+    T_y, T_x = _low_pass_pyramid_axes(Z, r)
+    B_y, B_x = _wrap_convolve(R_y, T_y), _wrap_convolve(R_x, T_x)
+    B_y, B_x = np.fft.fftshift(B_y / np.max(B_y)), \
+        np.fft.fftshift(B_x / np.max(B_x))
+    W = np.outer(B_y.astype(FILTER_DTYPE), B_x.astype(FILTER_DTYPE))
+    return W
+
+
+def _low_pass_rectancle_axes(Z, r):
+    # the rectangle is separable, hence describe it along each axis
+    Fx, Fy = make_fourier_grid(Z, indexing='xy', system='normalized')
+    R_y, R_x = np.abs(Fy[:, 0]) <= r, np.abs(Fx[0, :]) <= r
+    return R_y, R_x
+
+
+def _low_pass_pyramid_axes(Z, r):
+    R_y, R_x = _low_pass_rectancle_axes(Z, r)
+    R_y, R_x = R_y.astype(float), R_x.astype(float)
+    T_y, T_x = _wrap_convolve(R_y, R_y), _wrap_convolve(R_x, R_x)
+    T_y, T_x = np.fft.fftshift(T_y / np.max(T_y)), \
+        np.fft.fftshift(T_x / np.max(T_x))
+    return T_y, T_x
+
+
+def _wrap_convolve(a, b):
+    # circular convolution along one axis, aligned as for signal.convolve2d
+    c = signal.convolve2d(a[np.newaxis, :],
+                          b[np.newaxis, :],
                           mode='same',
                           boundary='wrap')
-    W = np.fft.fftshift(W / np.max(W))
-    return W
+    return c[0, :]
 
 
 def low_pass_circle(Z, r=0.50):
@@ -748,11 +837,7 @@ def low_pass_circle(Z, r=0.50):
     if type(Z) in (np.ma.core.MaskedArray, ):
         Z = np.ma.getdata(Z)
 
-    Fx, Fy = make_fourier_grid(Z,
-                               indexing='xy',
-                               system='normalized',
-                               shift=False)
-    R = np.hypot(Fx, Fy)  # radius
+    R = _make_fourier_radius(*Z.shape, shift=False)  # radius
     # filter formulation
     W = R <= r
     return W
@@ -782,9 +867,8 @@ def low_pass_ellipse(Z, r1=0.50, r2=0.50):
     sc = r1 / r2
     assert isinstance(Z, np.ndarray), "please provide an array"
     Fx, Fy = make_fourier_grid(Z, indexing='xy', system='normalized')
-    R = np.hypot(sc * Fx, Fy)  # radius
-    # filter formulation
-    W = R <= r1
+    # filter formulation, on the squared radius along the grid axes
+    W = np.square(sc * Fx[:1, :]) + np.square(Fy[:, :1]) <= r1**2
     return W
 
 
@@ -808,8 +892,7 @@ def high_pass_circle(Z, r=0.50):
     raised_cosine, cosine_bell, low_pass_circle
     """
     assert isinstance(Z, np.ndarray), "please provide an array"
-    Fx, Fy = make_fourier_grid(Z, indexing='xy', system='normalized')
-    R = np.hypot(Fx, Fy)  # radius
+    R = _make_fourier_radius(*Z.shape)  # radius
     # filter formulation
     W = R >= r
     return W
@@ -833,11 +916,13 @@ def cosine_bell(Z):
     raised_cosine
     """
     assert isinstance(Z, np.ndarray), "please provide an array"
-    Fx, Fy = make_fourier_grid(Z, indexing='xy', system='normalized')
-    R = np.hypot(Fx, Fy)  # radius
+    R = _make_fourier_radius(*Z.shape)  # radius
 
     # filter formulation
-    W = .5 * np.cos(2 * R * np.pi) + .5
+    W = np.multiply(R, 2 * np.pi, dtype=FILTER_DTYPE)
+    np.cos(W, out=W)
+    W *= .5
+    W += .5
     W[R > .5] = 0
     return W
 
@@ -866,11 +951,11 @@ def cross_shading_filter(Q, az_1, az_2):  # todo
               Imperical College London, 2015.
     """
     F_1, F_2 = make_fourier_grid(Q, indexing='xy', system='radians')
-    θ = np.angle(F_2 + 1j * F_1)
+    θ = np.arctan2(F_1, F_2)
+    c_θ, s_θ = np.cos(θ), np.sin(θ)
     az_1, az_2 = np.deg2rad(az_1), np.deg2rad(az_2)
 
-    def _get_angular_sel(θ, az_1, az_2):
-        c_θ, s_θ = np.cos(θ), np.sin(θ)
+    def _get_angular_sel(c_θ, s_θ, az_1, az_2):
         c_down = np.minimum(np.cos(az_1), np.cos(az_2))
         s_down = np.minimum(np.sin(az_1), np.sin(az_2))
         c_up = np.maximum(np.cos(az_1), np.cos(az_2))
@@ -881,14 +966,12 @@ def cross_shading_filter(Q, az_1, az_2):  # todo
                            np.less(s_θ, s_up)))  # (4.42) in [1], pp.51
         return OUT
 
-    W = np.ones_like(Q, dtype=float)
     down, up = az_2 - (3 * np.pi / 2), az_1 - (np.pi / 2)
-    OUT1 = _get_angular_sel(θ, down, up)
-    np.putmask(W, OUT1, 0)
+    OUT = _get_angular_sel(c_θ, s_θ, down, up)
 
     down, up = az_2 - (np.pi / 2), az_1 + (np.pi / 2)
-    OUT2 = _get_angular_sel(θ, down, up)
-    np.putmask(W, OUT2, 0)
+    OUT |= _get_angular_sel(c_θ, s_θ, down, up)
+    W = np.logical_not(OUT).astype(FILTER_DTYPE)
     return W
 
 
@@ -933,7 +1016,17 @@ def thresh_masking(S, m=1e-4, s=10):
     # compose filter
     M = S_bar > th
     if s > 0:
-        M = ndimage.median_filter(M, size=(s, s))
+        M = _binary_median_filter(M, s)
+    return M
+
+
+def _binary_median_filter(M, s):
+    # the median of a boolean neighborhood is a threshold on the number of
+    # true elements, which follows from a separable box filter. The rank
+    # and alignment are the same as for ndimage.median_filter
+    N = ndimage.uniform_filter(M.astype(float), size=(s, s))
+    N *= s**2
+    M = np.rint(N) >= s**2 - (s**2 // 2)
     return M
 
 
@@ -945,14 +1038,14 @@ def perc_masking(S, m=.95, s=10):
     # compose filter
     M = S_bar > th
     if s > 0:
-        M = ndimage.median_filter(M, size=(s, s))
+        M = _binary_median_filter(M, s)
     return M
 
 
 def coherence_masking(S, m=.7, s=0):
     M = local_coherence(normalize_power_spectrum(S)) > m
     if s > 0:
-        M = ndimage.median_filter(M, size=(s, s))
+        M = _binary_median_filter(M, s)
     return M
 
 
@@ -984,13 +1077,14 @@ def adaptive_masking(S, m=.9):
               1529-1558, 2007.
     """
     assert isinstance(S, np.ndarray), "please provide an array"
-    np.seterr(divide='ignore')
-    LS = np.log10(np.abs(S))
-    LS[np.isinf(LS)] = np.nan
-    np.seterr(divide='warn')
+    S_abs = np.abs(S)
+    IN = S_abs != 0  # empty frequencies are excluded from the statistics
+    # clip the magnitude, so no infinities are introduced
+    np.maximum(S_abs, np.finfo(S_abs.dtype).tiny, out=S_abs)
+    LS = np.log10(S_abs, out=S_abs)
 
-    NLS = LS - np.nanmax(LS.flatten())
-    mean_NLS = m * np.nanmean(NLS.flatten())
+    NLS = LS - np.max(LS)
+    mean_NLS = m * np.mean(NLS, where=IN)
 
     M = NLS > mean_NLS
     return M
@@ -1035,6 +1129,7 @@ def gaussian_mask(S):
     (m, n) = S.shape
     Fx, Fy = make_fourier_grid(S, indexing='xy', system='normalized')
 
-    M = np.exp(-.5 * ((Fy * np.pi) / m)**2) * np.exp(-.5 *
-                                                     ((Fx * np.pi) / n)**2)
+    # the Gaussian is separable, hence only evaluate it along the axes
+    M = np.exp(-.5 * ((Fy[:, :1] * np.pi) / m)**2).astype(FILTER_DTYPE) * \
+        np.exp(-.5 * ((Fx[:1, :] * np.pi) / n)**2).astype(FILTER_DTYPE)
     return M
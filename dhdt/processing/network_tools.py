@@ -1,5 +1,5 @@
 import numpy as np
-from sklearn.neighbors import NearestNeighbors
+from scipy.spatial import cKDTree
 
 from ..input.read_sentinel2 import read_mean_sun_angles_s2
 
@@ -71,8 +71,9 @@ def get_network_indices_constrained(idx,
 
     if d.ndim == 1:
         d = d.reshape(-1, 1)
-    nbrs = NearestNeighbors(n_neighbors=n_max + 1, algorithm='auto').fit(d)
-    distances, indices = nbrs.kneighbors(d)
+    distances, indices = cKDTree(d).query(d,
+                                          k=list(range(1, n_max + 2)),
+                                          workers=-1)
 
     IN = distances[:, 1:] <= d_max
 
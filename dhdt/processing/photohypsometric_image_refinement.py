@@ -333,14 +333,12 @@ def update_list_with_refined_casted(dh, file_dir, file_name='conn.txt'):
         ('please provide a pandas dataframe')
     assert np.all([header in dh.columns for header in col_order])
 
-    # write to file
-    f = open(os.path.join(file_dir, file_name), 'w')
-
+    lines = []
     # if timestamp is give, add this to the
     timestamps = dh['timestamp'].unique()
     if len(timestamps) == 1:
-        print('# time: ' + np.datetime_as_string(timestamps[0], unit='D'),
-              file=f)
+        lines.append('# time: ' +
+                     np.datetime_as_string(timestamps[0], unit='D') + '\n')
     else:
         col_order = ('timestamp', ) + col_order
         col_frmt = ('place_holder', ) + col_order
@@ -351,17 +349,17 @@ def update_list_with_refined_casted(dh, file_dir, file_name='conn.txt'):
     # add header
     col_idx = dh_sel.columns.get_indexer(list(col_order))
     IN = col_idx != -1
-    print('# ' + ' '.join(tuple(np.array(col_order)[IN])), file=f)
+    lines.append('# ' + ' '.join(tuple(np.array(col_order)[IN])) + '\n')
     col_idx = col_idx[IN]
 
-    # write rows of dataframe into text file
-    for k in range(dh_sel.shape[0]):
+    # format rows of dataframe
+    for row in dh_sel.itertuples(index=False, name=None):
         line = ''
         for idx, val in enumerate(col_idx):
             if col_order[val] == 'timestamp':
-                line += np.datetime_as_string(dh_sel.iloc[k, val], unit='D')
+                line += np.datetime_as_string(row[val], unit='D')
             else:
-                elem = dh_sel.iloc[k, val]
+                elem = row[val]
                 if elem is None:
                     # refinement or refraction seem to have an error
                     # find
@@ -369,8 +367,11 @@ def update_list_with_refined_casted(dh, file_dir, file_name='conn.txt'):
                 else:
                     line += col_frmt[idx].format(elem)
             line += ' '
-        print(line[:-1], file=f)  # remove last spacer
-    f.close()
+        lines.append(line[:-1] + '\n')  # remove last spacer
+
+    # write to file, all at once
+    with open(os.path.join(file_dir, file_name), 'w') as f:
+        f.writelines(lines)
     return
 
 
@@ -0,0 +1,36 @@
+import numpy as np
+from scipy import ndimage
+
+from dhdt.generic.handler_im import apply_in_tiles, get_tiling_grid
+
+
+def _median_filter(Z):
+    return ndimage.median_filter(Z, size=5)
+
+
+def test_get_tiling_grid():
+    bbox = (10, 1000, 20, 777)
+    windows, cores = get_tiling_grid(bbox, tile_size=256, overlap=16)
+
+    # the cores should cover the bounding box exactly once
+    Cnt = np.zeros((bbox[1], bbox[3]), dtype=int)
+    for core in cores:
+        Cnt[core[0]:core[1], core[2]:core[3]] += 1
+    assert np.all(Cnt[bbox[0]:bbox[1], bbox[2]:bbox[3]] == 1)
+    assert np.sum(Cnt) == (bbox[1] - bbox[0]) * (bbox[3] - bbox[2])
+
+    # the windows enclose their core, but stay within the bounding box
+    assert np.all(windows[:, 0::2] <= cores[:, 0::2])
+    assert np.all(windows[:, 1::2] >= cores[:, 1::2])
+    assert np.all(windows[:, 0::2] >= np.array(bbox)[0::2])
+    assert np.all(windows[:, 1::2] <= np.array(bbox)[1::2])
+
+
+def test_apply_in_tiles():
+    Z = np.random.default_rng(0).random((150, 203))
+    Z_tile = apply_in_tiles(Z,
+                            _median_filter,
+                            tile_size=64,
+                            overlap=8,
+                            max_workers=2)
+    assert np.array_equal(Z_tile, _median_filter(Z))
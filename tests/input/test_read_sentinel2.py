@@ -0,0 +1,51 @@
+import os
+import tempfile
+
+import numpy as np
+
+from dhdt.input.read_sentinel2 import read_sun_angles_s2
+
+
+def _values_list_xml(Grd):
+    rows = ''.join(f'<VALUES>{" ".join(map(str, row))}</VALUES>'
+                   for row in Grd)
+    return f'<Values_List>{rows}</Values_List>'
+
+
+def _create_mtd_tl_xml(fpath, m, n, Zn, Az):
+    xml = ('<n1:Level-1C_Tile_ID xmlns:n1="https://psd-14.sentinel2.eo.esa.int'
+           '/PSD/S2_PDI_Level-1C_Tile_Metadata.xsd"><n1:Geometric_Info>'
+           '<Tile_Geocoding><Size resolution="10">'
+           f'<NROWS>{m}</NROWS><NCOLS>{n}</NCOLS></Size></Tile_Geocoding>'
+           '<Tile_Angles><Sun_Angles_Grid>'
+           '<Zenith><COL_STEP unit="m">5000</COL_STEP>'
+           '<ROW_STEP unit="m">5000</ROW_STEP>'
+           f'{_values_list_xml(Zn)}</Zenith>'
+           '<Azimuth><COL_STEP unit="m">5000</COL_STEP>'
+           '<ROW_STEP unit="m">5000</ROW_STEP>'
+           f'{_values_list_xml(Az)}</Azimuth>'
+           '</Sun_Angles_Grid></Tile_Angles>'
+           '</n1:Geometric_Info></n1:Level-1C_Tile_ID>')
+    with open(fpath, 'w') as f:
+        f.write(xml)
+
+
+def test_read_sun_angles_s2():
+    m, n = 60, 40  # non-square, so a transpose would show up
+    a, b = np.mgrid[0:4, 0:5]
+    # planar grids, hence the bi-linear interpolation is exact
+    Zn_grd, Az_grd = 30. + a + 2. * b, 150. + .5 * a - b
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _create_mtd_tl_xml(os.path.join(tmpdir, 'MTD_TL.xml'), m, n, Zn_grd,
+                           Az_grd)
+        Zn, Az = read_sun_angles_s2(tmpdir)
+    assert Zn.shape == (m, n)
+    assert Az.shape == (m, n)
+
+    # the coarse grid spans ten pixels beyond the image boundary
+    for i, j in ((0, 0), (m - 1, 0), (0, n - 1), (m - 1, n - 1)):
+        a_ij = (i + 10) / (m + 20) * (Zn_grd.shape[0] - 1)
+        b_ij = (j + 10) / (n + 20) * (Zn_grd.shape[1] - 1)
+        assert np.isclose(Zn[i, j], 30. + a_ij + 2. * b_ij)
+        assert np.isclose(Az[i, j], 150. + .5 * a_ij - b_ij)
@@ -1,11 +1,39 @@
 import numpy as np
+from scipy import ndimage
 
 from dhdt.generic.unit_conversion import deg2compass
 from dhdt.postprocessing.solar_tools import (az_to_sun_vector,
+                                             make_doppler_range,
+                                             make_shadowing,
                                              sun_angles_to_vector,
                                              vector_to_sun_angles)
 
 
+def _create_rough_dem(m=120, n=100, seed=1):
+    rng = np.random.default_rng(seed)
+    Z = ndimage.gaussian_filter(rng.random((m, n)), 3) * 400
+    Z += rng.random((m, n)) * 5
+    return Z
+
+
+def _ray_march_shadowing(Z, az, zn, spac):
+    """ brute-force reference, march from every pixel towards the sun and
+    look if the terrain along the way rises above the sun ray """
+    m, n = Z.shape
+    d_i, d_j = np.cos(np.radians(az)), -np.sin(np.radians(az))
+    dZ = np.tan(np.radians(90 - zn)) * spac
+    I, J = np.mgrid[0:m, 0:n].astype(float)
+    Sw = np.zeros((m, n), dtype=bool)
+    for t in range(1, int(np.hypot(m, n)) + 1):
+        I_t, J_t = I - t * d_i, J - t * d_j
+        IN = (I_t > -.5) & (I_t < m - .5) & (J_t > -.5) & (J_t < n - .5)
+        if not np.any(IN):
+            break
+        Z_t = ndimage.map_coordinates(Z, [I_t, J_t], order=1, mode='nearest')
+        Sw |= IN & (Z_t - t * dZ > Z)
+    return Sw
+
+
 def test_sun_angles_to_vector():
     az = np.random.uniform(low=0., high=360., size=(1, ))[0]
     zn = np.random.uniform(low=0., high=90., size=(1, ))[0]
@@ -29,3 +57,36 @@ def test_az_to_sun_vector():
         az_r = vector_to_sun_angles(s, indexing=idx)[0]
         az_r = deg2compass(az_r)
         assert np.isclose(0, np.abs(az - az_r))
+
+
+def test_make_shadowing_along_column():
+    Z = _create_rough_dem()
+    Sw = make_shadowing(Z, 0., 60., spac=10)
+    Sw_ref = _ray_march_shadowing(Z, 0., 60., 10)
+    # the border is copied from its neighbours, hence exclude it
+    assert np.array_equal(Sw[1:-1, 1:-1], Sw_ref[1:-1, 1:-1])
+
+
+def test_make_shadowing_oblique():
+    Z = _create_rough_dem()
+    for az in (30., 135., -100.):
+        Sw = make_shadowing(Z, az, 60., spac=10)
+        Sw_ref = _ray_march_shadowing(Z, az, 60., 10)
+        # rays are sampled at a slightly different position than the pixel
+        # centers, hence a small disagreement along shadow edges is present
+        assert np.mean(Sw[1:-1, 1:-1] == Sw_ref[1:-1, 1:-1]) >= .97
+
+
+def test_make_doppler_range():
+    Z = ndimage.gaussian_filter(np.random.default_rng(4).random((60, 45)), 3)
+    Z = Z * 15 + 5
+    for az in (0., 30., -110.):
+        S_r = make_doppler_range(Z, az, 30., Lambertian=False, spac=1)
+        # without weighting, every pixel within the grid is counted once
+        M_r = ndimage.rotate(np.ones_like(Z, dtype=bool),
+                             az,
+                             axes=(1, 0),
+                             reshape=True,
+                             order=0)
+        assert S_r.shape == M_r.shape
+        assert np.array_equal(np.sum(S_r, axis=1), np.sum(M_r, axis=1))
@@ -0,0 +1,59 @@
+import numpy as np
+from shapely.geometry import Polygon
+
+from dhdt.preprocessing.shadow_geometry import (find_polygon_intersect,
+                                                list_occluder_and_casted,
+                                                trace_cast_along_polygon)
+
+
+def _create_rectangle_labels():
+    labels = np.ones((80, 100), dtype=int)
+    labels[20:40, 30:60] = 2
+    # same rectangle in vector format, with (j,i) coordinates
+    poly = Polygon([(30, 20), (59, 20), (59, 39), (30, 39)])
+    return labels, poly
+
+
+def test_trace_cast_along_polygon():
+    labels, _ = _create_rectangle_labels()
+    ridge_i, ridge_j = np.array([20, 25, 20]), np.array([40, 59, 35])
+    sun_az = np.array([0., 90., 45.])
+    cast_i, cast_j = trace_cast_along_polygon(labels, ridge_i, ridge_j,
+                                              sun_az)
+    # the last sample within the rectangle
+    t = 7
+    cast_i_tru = np.array([39., 25., 20 + t * np.cos(np.radians(45.))])
+    cast_j_tru = np.array([40., 30., 35 - t * np.sin(np.radians(45.))])
+    assert np.allclose(cast_i, cast_i_tru)
+    assert np.allclose(cast_j, cast_j_tru)
+
+
+def test_trace_cast_along_polygon_leaving_directly():
+    labels, _ = _create_rectangle_labels()
+    # casters at the far side of the polygon, and one running along its edge
+    ridge_i, ridge_j = np.array([39, 25, 30]), np.array([40, 30, 30])
+    sun_az = np.array([0., 90., 30.])
+    cast_i, cast_j = trace_cast_along_polygon(labels, ridge_i, ridge_j,
+                                              sun_az)
+    assert np.all(np.isnan(cast_i))
+    assert np.all(np.isnan(cast_j))
+
+
+def test_list_occluder_and_casted():
+    labels, poly = _create_rectangle_labels()
+    geoTransform = (0., 1., 0., 0., 0., -1.)
+    sun_zn = np.full(labels.shape, 60.)
+    for az in (0., 30., -45., 120.):
+        sun_az = np.full(labels.shape, az)
+        cast_list = list_occluder_and_casted(labels, sun_zn, sun_az,
+                                             geoTransform)
+        assert len(cast_list) > 0
+        for cast_line in cast_list:
+            ridge_i, ridge_j = -cast_line[1], cast_line[0]
+            cast_line_tru = find_polygon_intersect(int(ridge_i),
+                                                   int(ridge_j), poly, az,
+                                                   60., geoTransform)
+            assert cast_line_tru is not None
+            # the raster trace stops within a pixel of the vector edge
+            assert np.hypot(cast_line[2] - cast_line_tru[2],
+                            cast_line[3] - cast_line_tru[3]) <= 1.
@@ -0,0 +1,57 @@
+import numpy as np
+from scipy.spatial.distance import cdist
+from scipy.stats import pearsonr, spearmanr, ttest_1samp, wilcoxon
+
+from dhdt.processing.geometric_correction_measures import (
+    ajne_test, scat_distribution, skew_distribution)
+
+
+def _create_misfits(n, θ_min=0., θ_max=360., seed=0):
+    rng = np.random.default_rng(seed)
+    θ = np.radians(rng.uniform(θ_min, θ_max, n))
+    ρ = rng.uniform(.1, 1., n)
+    return np.column_stack((ρ * np.cos(θ), ρ * np.sin(θ)))
+
+
+def test_ajne_test():
+    for n in (30, 100):  # both the [Aj68] and the [Ho55] formulation
+        dXY = _create_misfits(n, seed=1)
+        assert .2 < ajne_test(dXY) <= 1.
+
+        # axial data, hence a quadrant is one-sided
+        dXY = _create_misfits(n, θ_min=5., θ_max=85., seed=1)
+        assert ajne_test(dXY) < 1E-3
+
+
+def test_scat_distribution():
+    XY_dim = [1000, 800]
+    r = .5 * np.mean(XY_dim)
+    rng = np.random.default_rng(2)
+    # both the Wilcoxon and the t-test, the latter spanning several blocks
+    for n in (25, 600):
+        XY = rng.uniform(0, 1, (n, 2)) * np.array(XY_dim)
+        dist = np.sum(cdist(XY, XY), axis=1) / (n - 1)
+        if n < 30:
+            Scat_tru = 1 - wilcoxon(dist).pvalue
+        else:
+            Scat_tru = 1 - ttest_1samp(dist, popmean=r).pvalue
+        assert np.isclose(scat_distribution(XY, XY_dim), Scat_tru)
+
+    # points clustered in a corner are far from well scattered
+    XY = rng.uniform(0, 50, (100, 2))
+    assert scat_distribution(XY, XY_dim) > .99
+
+
+def test_skew_distribution():
+    rng = np.random.default_rng(3)
+    for n in (12, 200):  # Spearman and Pearson
+        dXY = rng.normal(size=(n, 2))
+        dXY[:, 1] += .5 * dXY[:, 0]
+        Skew_tru = spearmanr(dXY[:, 0], dXY[:, 1])[0] if n < 20 else \
+            pearsonr(dXY[:, 0], dXY[:, 1])[0]
+        assert np.isclose(skew_distribution(dXY), Skew_tru)
+
+    # a monotonic, though non-linear, relation is fully correlated in rank
+    dXY = rng.normal(size=(12, 2))
+    dXY[:, 1] = np.exp(dXY[:, 0])
+    assert np.isclose(skew_distribution(dXY), 1.)
@@ -0,0 +1,78 @@
+import numpy as np
+
+from dhdt.processing.matching_tools_frequency_filters import (
+    local_coherence, perdecomp)
+
+
+def _local_coherence_by_rolling(Q, ds):
+    C = np.zeros_like(Q)
+    for i in range(-ds, ds + 1):
+        for j in range(-ds, ds + 1):
+            if i == 0 and j == 0:
+                continue
+            C += Q * np.conj(np.roll(Q, (i, j), axis=(0, 1)))
+    return np.abs(C) / ((2 * ds + 1)**2 - 1)
+
+
+def test_local_coherence():
+    rng = np.random.default_rng(1)
+    Q = np.exp(1j * rng.uniform(-np.pi, +np.pi, size=(32, 27)))
+    for ds in (1, 2):
+        C = local_coherence(Q, ds=ds)
+        assert np.allclose(C, _local_coherence_by_rolling(Q, ds))
+
+
+def _perdecomp_by_fft2(Z):
+    m, n = Z.shape
+    # border image, i.e. the jumps across the periodic boundary, see [Mo11]
+    V = np.zeros_like(Z)
+    V[+0, :], V[-1, :] = Z[0, :] - Z[-1, :], Z[-1, :] - Z[0, :]
+    V[:, +0] += Z[:, 0] - Z[:, -1]
+    V[:, -1] += Z[:, -1] - Z[:, 0]
+
+    F = 2 - np.cos(2 * np.pi * np.arange(m) / m)[:, np.newaxis] \
+        - np.cos(2 * np.pi * np.arange(n) / n)[np.newaxis, :]
+    F[0, 0] = 1.
+    S = np.fft.fft2(V) * .5 / F
+    S[0, 0] = 0.
+    cor = np.real(np.fft.ifft2(S))
+    return Z - cor, cor
+
+
+def _periodic_border_jump(Z):
+    return np.sum((Z[0, :] - Z[-1, :])**2) + np.sum((Z[:, 0] - Z[:, -1])**2)
+
+
+def test_perdecomp_by_fft2():
+    rng = np.random.default_rng(4)
+    for m, n in ((40, 33), (32, 32), (17, 50)):  # odd and even sizes
+        Z = rng.random((m, n)) + np.linspace(0, 5, n)[np.newaxis, :]
+        per, cor = perdecomp(Z)
+        per_tru, cor_tru = _perdecomp_by_fft2(Z)
+        assert np.allclose(cor, cor_tru)
+        assert np.allclose(per, per_tru)
+
+        # the smooth component has no offset, while the periodic component
+        # continues over its borders
+        assert np.isclose(np.mean(cor), 0.)
+        assert _periodic_border_jump(per) < .1 * _periodic_border_jump(Z)
+
+
+def test_perdecomp():
+    rng = np.random.default_rng(2)
+    Z = rng.random((40, 33, 3))
+    per, cor = perdecomp(Z)
+    assert np.allclose(per + cor, Z)
+    # bands should be decomposed independently from each other
+    for b in range(Z.shape[2]):
+        per_b, cor_b = perdecomp(Z[..., b])
+        assert np.allclose(per_b, per[..., b])
+        assert np.allclose(cor_b, cor[..., b])
+
+
+def test_perdecomp_single_precision():
+    Z = np.random.default_rng(3).random((40, 33)).astype(np.float32)
+    per, cor = perdecomp(Z)
+    assert per.dtype == np.float32
+    assert cor.dtype == np.float32
+    assert np.allclose(per + cor, Z, atol=1E-5)